@@ -6,8 +6,20 @@ Modules
 - hcc2_rest_enums : Common schema attribute enumerations.
 - hcc2_rest_schema : Schema dataclasses used by the REST API class.
 - hcc2_rest : REST API class.
+- hcc2_rest_async : Asyncio REST API class.
+- hcc2_rest_resilience : Retry policy and circuit breaker used by the REST API classes.
+- hcc2_rest_clock : Epoch millisecond clock used to timestamp REST messages.
+- hcc2_rest_columnar : Columnar multi-tag message schemas backed by typed arrays.
+- hcc2_rest_decode : Per-topic conversion of message values to native types.
+- hcc2_rest_topics : Registry of interned tag topic FQNs with integer topic IDs.
 """
 
 from .hcc2_rest import *
+from .hcc2_rest_async import AsyncRestAPI, AsyncResponse
+from .hcc2_rest_resilience import CircuitState, CircuitOpenError, RetryPolicy, CircuitBreaker
+from .hcc2_rest_clock import EpochClock, epoch_clock
+from .hcc2_rest_columnar import ColumnarDataPoint, ColumnarComplexMessage
+from .hcc2_rest_decode import ValueDecoders, value_decoders
+from .hcc2_rest_topics import TopicInfo, TopicRegistry, topic_registry
 from .hcc2_rest_enums import *
 from .hcc2_rest_schema import *
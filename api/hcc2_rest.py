@@ -4,26 +4,41 @@ REST API utility class.
 """
 
 import os
-import io
 import sys
+import time
+import atexit
 import socket
 import logging
-from typing import Union, List
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Union, List, Optional
+from dataclasses import dataclass, field
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 
 # Third party
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.exceptions import NewConnectionError
 
 # Local
 from api.hcc2_rest_schema import (
     GeneralDataPoint, ConfigDataPoint, 
-    SimpleMessage, ComplexMessage, DataPoint
+    SimpleMessage, ComplexMessage, DataPoint,
+    json_codec
 )
+from api.hcc2_rest_columnar import ColumnarComplexMessage
+from api.hcc2_rest_decode import value_decoders
+from api.hcc2_rest_topics import topic_registry
 from api.hcc2_rest_enums import (
     TagCategory
 )
+from api.hcc2_rest_resilience import (
+    RetryPolicy, CircuitBreaker, CircuitState
+)
 from config import AppConfig
 
 # Logging
@@ -31,12 +46,262 @@ hcc2_logger = logging.getLogger(AppConfig.app_func_name)
 hcc2_logger.propagate = False
 
 
+# HTTP methods safe to resend after an unknown outcome
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+
+
+def _not_sent(exc: Exception) -> bool:
+    """Return True if a request exception occurred before the request reached the server."""
+
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _topic_list(topics) -> list[str]:
+    """Normalize one or many topics to a list of tag topic strings (FQN)."""
+
+    if not isinstance(topics, list):
+        topics = [topics]
+
+    # Resolve data point dataclasses to their tag topic string (FQN)
+    return [t.fqn if isinstance(t, (GeneralDataPoint, ConfigDataPoint)) else t for t in topics]
+
+
+def _message_list(topics, message_types: tuple) -> list[dict]:
+    """Normalize one or many write messages to a list of message dicts."""
+
+    if not isinstance(topics, list):
+        topics = [topics]
+
+    return [topic.to_dict() if isinstance(topic, message_types) else topic for topic in topics]
+
+
+def _message_body(topics, message_types: tuple) -> dict:
+    """Return request keyword arguments for a message write body.
+
+    Pre-encoded JSON bytes are sent as is."""
+
+    if isinstance(topics, (bytes, bytearray, memoryview)):
+        return {"data": topics, "json_body": True}
+
+    return {"json": _message_list(topics, message_types)}
+
+
+def _simple_messages(response_json: list) -> list[SimpleMessage]:
+    """Parse a message/read response body into SimpleMessages. Topics are interned."""
+
+    return [
+        SimpleMessage(
+            (topic := topic_registry.intern(j['topic']).fqn),
+            value_decoders.decode(topic, j['value']),
+            j['msgSource'],
+            j['quality'],
+            j['timeStamp']
+        )
+        for j in response_json]
+
+
+def _complex_messages(response_json: list) -> list[ComplexMessage]:
+    """Parse a message/read-advanced response body into ComplexMessages."""
+
+    return [
+        ComplexMessage(
+            j['topic'],
+            [DataPoint(
+                i['dataPointName'],
+                value_decoders.decode(j['topic'], i['values']),
+                i['quality'],
+                i['timeStamps']
+                )
+                for i in j['datapoints']
+            ],
+            j['msgSource'],
+        )
+        for j in response_json]
+
+
+def _columnar_messages(response_json: list, data_types=None) -> list[ColumnarComplexMessage]:
+    """Parse a message/read-advanced response body into ColumnarComplexMessages.
+
+    Without `data_types`, array types come from the registered data type of each topic."""
+
+    return [ColumnarComplexMessage.from_wire(j, data_types or value_decoders.data_type(j['topic'])) for j in response_json]
+
+
+@dataclass
+class ChunkResult:
+    """
+    Outcome of one chunk of a bulk message write.
+
+    Attributes:
+    -----------
+    index: int
+        Position of the chunk within the bulk write.
+    topics: List[str]
+        Tag topics written by the chunk.
+    size: int
+        Encoded request body size in bytes.
+    status_code: Optional[int]
+        HTTP status of the last attempt, None if no response was received.
+    attempts: int
+        Number of times the chunk was sent.
+    error: str
+        Error text of the last failed attempt.
+    """
+    index: int
+    topics: List[str]
+    size: int
+    status_code: Optional[int] = None
+    attempts: int = 0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """True if the chunk was written."""
+        return self.status_code is not None and self.status_code < 400
+
+
+@dataclass
+class BulkWriteResult:
+    """
+    Per-chunk summary of a bulk message write.
+
+    Attributes:
+    -----------
+    chunks: List[ChunkResult]
+        Result of every chunk in send order.
+    """
+    chunks: List[ChunkResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if every chunk was written."""
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def failed_chunks(self) -> List[ChunkResult]:
+        """Chunks which could not be written."""
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def failed_topics(self) -> List[str]:
+        """Tag topics which could not be written."""
+        return [topic for chunk in self.failed_chunks for topic in chunk.topics]
+
+
+class _ReadBatch:
+    """Topics gathered for a single coalesced message/read request."""
+
+    __slots__ = ("topics", "full", "done", "results", "error")
+
+    def __init__(self):
+        self.topics = {}
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results = {}
+        self.error = None
+
+
+class ReadCoalescer:
+    """Merge message/read requests made by many threads into fewer POSTs.
+
+    The first caller in a window becomes the batch leader. It waits up to
+    `window` seconds (or until `max_topics` is reached) for other callers to
+    add their topics, sends one message/read with the union of topics and
+    fans the results back out. Per-caller latency is bounded by the window
+    plus one request round-trip.
+
+    Callers sharing a batch receive the same SimpleMessage instances.
+    """
+
+    def __init__(self, window: float, max_topics: int):
+        self.window = window
+        self.max_topics = max_topics
+        self._lock = threading.Lock()
+        self._batches = {}
+        self.reads = 0
+        self.requests = 0
+
+    def read(self, rest_api: "RestAPI", topics: list[str]) -> list[SimpleMessage]:
+        """Read topics through a shared batch. Returns as list of SimpleMessage."""
+
+        key = rest_api.url
+        with self._lock:
+            self.reads += 1
+            batch = self._batches.get(key)
+            # Topics already in the batch are shared, only new ones count toward the limit
+            is_leader = batch is None or len(batch.topics.keys() | set(topics)) > self.max_topics
+
+            if is_leader:
+                if batch is not None:
+                    # Batch is full, release its leader early
+                    batch.full.set()
+                batch = _ReadBatch()
+                self._batches[key] = batch
+
+            batch.topics.update(dict.fromkeys(topics))
+            if len(batch.topics) >= self.max_topics:
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self.window)
+
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+                self.requests += 1
+
+            try:
+                batch.results = {m.topic: m for m in rest_api.message_read_simple_direct(list(batch.topics))}
+            except Exception as exc:
+                batch.error = exc
+            finally:
+                batch.done.set()
+
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        return [batch.results[t] for t in topics if t in batch.results]
+
+    def stats(self) -> dict:
+        """Return the number of coalesced reads and the POSTs actually sent."""
+        with self._lock:
+            return {"reads": self.reads, "requests": self.requests}
+
+
 class RestAPI:
     """A class to interact with the HCC2 REST Server."""
 
     container_version = "0.1.0-r20250219.3"
     api_version = "V1"
 
+    # Keep-alive connection pool shared by every RestAPI instance
+    _session = None
+    _session_lock = threading.Lock()
+
+    # JSON codec for request and response bodies
+    codec = json_codec
+
+    # Opt-in message/read coalescing shared by every RestAPI instance
+    read_coalescer = None
+
+    # Resilience shared by every RestAPI instance
+    retry_policy = RetryPolicy(
+        attempts=AppConfig.rest_retry_attempts,
+        base_delay=AppConfig.rest_retry_backoff,
+        max_delay=AppConfig.rest_retry_backoff_max
+    )
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=AppConfig.rest_breaker_failure_threshold,
+        reset_timeout=AppConfig.rest_breaker_reset_timeout
+    )
+
     def __init__(self, version=1):
         self.version = version
         self.timeout = 3
@@ -46,6 +311,109 @@ class RestAPI:
         """Rest API base URL"""
         return f'http://{AppConfig.rest_ip}:{AppConfig.rest_port}/api/v{self.version}/'
 
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Return the shared HTTP session, creating its connection pool on first use."""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    adapter = HTTPAdapter(
+                        pool_connections=AppConfig.rest_pool_connections,
+                        pool_maxsize=AppConfig.rest_pool_maxsize,
+                        pool_block=AppConfig.rest_pool_block
+                    )
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def close(cls):
+        """Close the shared HTTP session and all pooled connections."""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+    @classmethod
+    def enable_read_coalescing(cls, window=None, max_topics=None) -> ReadCoalescer:
+        """Coalesce concurrent message_read_simple calls from all threads.
+
+        Window is in seconds, defaults are taken from config.json."""
+        cls.read_coalescer = ReadCoalescer(
+            window=AppConfig.rest_read_coalesce_window if window is None else window,
+            max_topics=max_topics or AppConfig.rest_read_coalesce_max_topics
+        )
+        return cls.read_coalescer
+
+    @classmethod
+    def disable_read_coalescing(cls):
+        """Send every message_read_simple call as its own request."""
+        cls.read_coalescer = None
+
+    def _request(self, method: str, endpoint: str, idempotent=None, retry=True, **kwargs) -> Response:
+        """Send a request to the REST server over the shared connection pool.
+
+        Requests pass through the shared circuit breaker and are retried with
+        jittered exponential backoff. Idempotent requests (GET/PUT/DELETE by
+        default) are retried on any connection error, timeout or retryable
+        status. Other requests are only retried if they never reached the server.
+        Retries stop once a failure opens the breaker, the failure is returned
+        or raised as is. `retry=False` sends the request once, for callers
+        running their own retries.
+
+        A `json` body is encoded once with the REST codec. Pre-encoded JSON
+        bytes can be passed as `data` with `json_body=True`.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            json_body = True
+        else:
+            json_body = kwargs.pop("json_body", False)
+        if json_body:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        url = urljoin(self.url, endpoint)
+        policy = RestAPI.retry_policy
+        breaker = RestAPI.circuit_breaker
+        attempt = 0
+
+        # File uploads are read when sent and cannot be replayed
+        attempts = 1 if kwargs.get("files") or not retry else policy.attempts
+
+        while True:
+            breaker.before_request()
+            try:
+                response = self.session().request(method, url, **kwargs)
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                breaker.record_failure()
+                attempt += 1
+                if attempt >= attempts or not (idempotent or _not_sent(exc)) or breaker.state == CircuitState.OPEN:
+                    raise
+                hcc2_logger.debug(f"{method} {endpoint} attempt {attempt} failed: {exc}")
+                time.sleep(policy.backoff(attempt - 1))
+                continue
+
+            except Exception:
+                breaker.release()
+                raise
+
+            if response.status_code not in policy.retry_statuses:
+                breaker.record_success()
+                return response
+
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= attempts or not idempotent or breaker.state == CircuitState.OPEN:
+                return response
+            response.close()
+            time.sleep(policy.backoff(attempt - 1))
+
 
     # Ping
     def ping(self, attempts=3) -> bool:
@@ -79,12 +447,10 @@ class RestAPI:
         # Convert tag list to dict
         tag_json = {"tagsList": [topic.to_dict() if isinstance(topic, (GeneralDataPoint, ConfigDataPoint)) else topic for topic in tag_list]}
 
-        return requests.request(
+        return self._request(
             "PUT",
-            urljoin(self.url, f"app-creator/{app_name}/datapoint/{tag_type}"),
-            json=tag_json,
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            f"app-creator/{app_name}/datapoint/{tag_type}",
+            json=tag_json
         )
 
 
@@ -92,10 +458,9 @@ class RestAPI:
     def initialize_app(self, app_name: str) -> Response:
         """Create an empty application."""
 
-        return requests.request(
+        return self._request(
             "PUT",
-            urljoin(self.url, f"app-creator/{app_name}/defaults"),
-            timeout=self.timeout
+            f"app-creator/{app_name}/defaults"
         )
 
     def open_app(self, app_name: str, config_file: str) -> requests.Response:
@@ -112,10 +477,10 @@ class RestAPI:
             }
 
             try:
-                response = requests.post(
-                    urljoin(self.url, f"app-creator/{app_name}"),
-                    files=files,
-                    timeout=self.timeout
+                response = self._request(
+                    "POST",
+                    f"app-creator/{app_name}",
+                    files=files
                 )
                 response.raise_for_status()
 
@@ -130,52 +495,100 @@ class RestAPI:
     def heartbeat_app(self, app_name: str, is_up=True) -> Response:
         """Emit application heartbeat."""
 
-        return requests.request(
+        return self._request(
             "PUT",
-            urljoin(self.url, f"app-provision/{app_name}"),
-            json={"isUp": is_up},
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            f"app-provision/{app_name}",
+            json={"isUp": is_up}
+        )
+
+    def provisioning_status(self, app_name: str) -> Response:
+        """Fetch the raw provisioning status of an application."""
+
+        return self._request(
+            "GET",
+            f"app-provision/{app_name}"
+        )
+
+    def provisioning_result(self, app_name: str, is_valid: bool) -> Response:
+        """Post the validation result of a provisioning deployment."""
+
+        return self._request(
+            "POST",
+            f"app-provision/{app_name}",
+            json={"isValid": is_valid}
         )
 
     def check_provisioning_status(self, app_name: str) -> bool:
         """Check on the provisioning status of an application."""
 
-        response = requests.request(
+        response = self._request(
             "GET",
-            urljoin(self.url, f"app-provision/{app_name}"),
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            f"app-provision/{app_name}"
         )
 
         if response.ok:
-            return response.json()["hasNewConfig"]
+            return self.codec.loads(response.content)["hasNewConfig"]
 
         return False
 
-    def get_targz_app(self, app_name: str) -> io.BytesIO:
-        """Fetch provisioning TAR.GZ data. Returns the data as a file object."""
+    def get_targz_app(self, app_name: str) -> tempfile.SpooledTemporaryFile:
+        """Fetch provisioning TAR.GZ data. Returns the data as a seekable file object.
+
+        Data is held in memory up to the configured spool size, then rolled
+        over to a temporary file in the spool directory."""
 
         try:
-            response = requests.get(
-                urljoin(self.url, f"app-provision/{app_name}/targz"),
-                timeout=self.timeout,
+            response = self._request(
+                "GET",
+                f"app-provision/{app_name}/targz",
                 stream=True)
 
             response.raise_for_status()
 
-            tar_gz_memory = io.BytesIO()
-            for chunk in response.iter_content(chunk_size=8192):
-                tar_gz_memory.write(chunk)
+            spool_dir = AppConfig.provisioning_spool_dir
+            tar_gz_file = tempfile.SpooledTemporaryFile(
+                max_size=AppConfig.provisioning_spool_bytes,
+                dir=spool_dir if os.path.isdir(spool_dir) else None
+            )
+            for chunk in response.iter_content(chunk_size=65536):
+                tar_gz_file.write(chunk)
 
             # Reset buffer
-            tar_gz_memory.seek(0)
+            tar_gz_file.seek(0)
 
-            return tar_gz_memory
+            return tar_gz_file
 
         except RequestException:
             return None
 
+    @contextmanager
+    def stream_targz_app(self, app_name: str):
+        """Stream provisioning TAR.GZ data without buffering it.
+
+        Yields a non-seekable file object for tarfile stream mode ("r|gz"),
+        or None if the data could not be fetched."""
+
+        try:
+            response = self._request(
+                "GET",
+                f"app-provision/{app_name}/targz",
+                stream=True)
+
+            response.raise_for_status()
+
+        except RequestException:
+            response = None
+
+        if response is None:
+            yield None
+            return
+
+        try:
+            response.raw.decode_content = True
+            yield response.raw
+        finally:
+            response.close()
+
 
     # Registration
     def register_app(self, app_name: str, config_file=None, is_complex_provisioned=False) -> Response:
@@ -194,43 +607,40 @@ class RestAPI:
         else:
             files = None
 
-        return requests.request(
+        return self._request(
             "POST",
-            urljoin(self.url, f"app-registration/{app_name}"),
+            f"app-registration/{app_name}",
             params=query_params,
-            files=files,
-            timeout=self.timeout
+            files=files
         )
 
 
     # Messages
     def message_read_simple(self, topics: List[Union[GeneralDataPoint, ConfigDataPoint, str]]) -> list[SimpleMessage]:
-        """Read any number of simple tag topics. Returns as list of SimpleMessage."""
+        """Read any number of simple tag topics. Returns as list of SimpleMessage.
 
-        if not isinstance(topics, list):
-            topics = [topics]
+        Reads are merged with other threads when read coalescing is enabled."""
+
+        topics = _topic_list(topics)
+
+        coalescer = RestAPI.read_coalescer
+        if coalescer is not None:
+            return coalescer.read(self, topics)
 
-        # Resolve data point dataclasses to their tag topic string (FQN)
-        topics = [t.fqn if isinstance(t, (GeneralDataPoint, ConfigDataPoint)) else t for t in topics]
+        return self.message_read_simple_direct(topics)
 
-        response = requests.request(
+    def message_read_simple_direct(self, topics: List[str]) -> list[SimpleMessage]:
+        """Read simple tag topics with a dedicated request, bypassing read coalescing."""
+
+        response = self._request(
             "POST",
-            urljoin(self.url, "message/read"),
-            json={"topics": topics, "includeOptional": True},
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            "message/read",
+            idempotent=True,
+            json={"topics": topics, "includeOptional": True}
         )
 
         if response.ok:
-            return [
-                SimpleMessage(
-                    j['topic'],
-                    j['value'],
-                    j['msgSource'],
-                    j['quality'],
-                    j['timeStamp']
-                )
-                for j in response.json()]
+            return _simple_messages(self.codec.loads(response.content))
 
         return []
 
@@ -240,97 +650,147 @@ class RestAPI:
         if not isinstance(topics, list):
             topics = [topics]
 
-        response = requests.request(
+        response = self._request(
             "POST",
-            urljoin(self.url, "message/read-advanced"),
-            json={"topics": topics},
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            "message/read-advanced",
+            idempotent=True,
+            json={"topics": topics}
         )
 
         if response.ok:
-            response_json = response.json()
-            return [
-                ComplexMessage(
-                    j['topic'],
-                    [DataPoint(
-                        i['dataPointName'],
-                        i['values'],
-                        i['quality'],
-                        i['timeStamps']
-                        )
-                        for i in j['datapoints']
-                    ],
-                    j['msgSource'],
-                )
-                for j in response_json]
+            return _complex_messages(self.codec.loads(response.content))
 
         return []
 
-    def message_write_simple(self, topics: List[Union[SimpleMessage, dict]]) -> Response:
-        """Write any number of simple tag topcis."""
-
-        if not isinstance(topics, list):
-            topics = [topics]
+    def message_read_columnar(self, topics: List[str], data_types: Union[dict, str, None] = None) -> list[ColumnarComplexMessage]:
+        """Read any number of simple or complex tag topics. Returns as list of ColumnarComplexMessage.
 
-        messages = [topic.to_dict() if isinstance(topic, SimpleMessage) else topic for topic in topics]
+        `data_types` is one TagDataType for all data points, or a dict of data
+        point name to TagDataType, used to choose the value array types.
+        Missing types are inferred from the values.
+        """
 
-        return requests.request(
+        response = self._request(
             "POST",
-            urljoin(self.url, "message/write"),
-            json=messages,
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            "message/read-advanced",
+            idempotent=True,
+            json={"topics": _topic_list(topics)}
         )
 
-    def message_write_complex(self, topics: List[Union[SimpleMessage, ComplexMessage, dict]]) -> Response:
-        """Write any number of simple or complex tag topcis."""
+        if response.ok:
+            return _columnar_messages(self.codec.loads(response.content), data_types)
 
-        if not isinstance(topics, list):
-            topics = [topics]
+        return []
+
+    def message_write_simple(self, topics: Union[List[Union[SimpleMessage, dict]], bytes]) -> Response:
+        """Write any number of simple tag topcis. Accepts pre-encoded JSON bytes."""
+
+        return self._request(
+            "POST",
+            "message/write",
+            idempotent=True,
+            **_message_body(topics, (SimpleMessage,))
+        )
 
-        messages = [topic.to_dict() if isinstance(topic, (SimpleMessage, ComplexMessage)) else topic for topic in topics]
+    def message_write_complex(self, topics: Union[List[Union[SimpleMessage, ComplexMessage, ColumnarComplexMessage, dict]], bytes]) -> Response:
+        """Write any number of simple or complex tag topcis. Accepts pre-encoded JSON bytes."""
 
-        return requests.request(
+        return self._request(
             "POST",
-            urljoin(self.url, "message/write-advanced"),
-            json=messages,
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            "message/write-advanced",
+            idempotent=True,
+            **_message_body(topics, (SimpleMessage, ComplexMessage, ColumnarComplexMessage))
         )
 
+    def message_write_bulk(self, topics: List[Union[SimpleMessage, ComplexMessage, ColumnarComplexMessage, dict]], advanced=False,
+                           chunk_size=None, max_chunk_bytes=None, max_in_flight=None, retries=None) -> BulkWriteResult:
+        """Write a large set of messages as several concurrent chunked requests.
+
+        Messages are encoded once and split into chunks bounded by message count
+        and encoded size. Up to `max_in_flight` chunks are sent at once. Failed
+        chunks alone are resent up to `retries` more times, with one request per
+        attempt. Defaults are taken from config.json. Set `advanced` to write through message/write-advanced.
+        """
+
+        chunk_size = chunk_size or AppConfig.rest_bulk_chunk_size
+        max_chunk_bytes = max_chunk_bytes or AppConfig.rest_bulk_chunk_bytes
+        max_in_flight = max_in_flight or AppConfig.rest_bulk_max_in_flight
+        retries = AppConfig.rest_bulk_retries if retries is None else retries
+        endpoint = "message/write-advanced" if advanced else "message/write"
+
+        messages = _message_list(topics, (SimpleMessage, ComplexMessage, ColumnarComplexMessage) if advanced else (SimpleMessage,))
+
+        # Build chunks of pre-encoded messages
+        chunks, bodies = [], []
+        parts, chunk_topics, size = [], [], 2
+        for message in messages:
+            encoded = self.codec.dumps(message)
+            if parts and (len(parts) >= chunk_size or size + len(encoded) + 1 > max_chunk_bytes):
+                bodies.append(b"[" + b",".join(parts) + b"]")
+                chunks.append(ChunkResult(len(chunks), chunk_topics, len(bodies[-1])))
+                parts, chunk_topics, size = [], [], 2
+            parts.append(encoded)
+            chunk_topics.append(message.get("topic", ""))
+            size += len(encoded) + 1
+
+        if parts:
+            bodies.append(b"[" + b",".join(parts) + b"]")
+            chunks.append(ChunkResult(len(chunks), chunk_topics, len(bodies[-1])))
+
+        def send(chunk: ChunkResult):
+            chunk.attempts += 1
+            try:
+                # Chunks are retried here, not inside _request
+                response = self._request("POST", endpoint, idempotent=True, retry=False,
+                                         data=bodies[chunk.index], json_body=True)
+                chunk.status_code = response.status_code
+                chunk.error = "" if response.ok else response.text
+            except RequestException as exc:
+                chunk.status_code = None
+                chunk.error = str(exc)
+
+        # Send all chunks, then resend only the chunks that failed
+        pending = chunks
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for attempt in range(retries + 1):
+                if attempt:
+                    time.sleep(RestAPI.retry_policy.backoff(attempt - 1))
+                list(executor.map(send, pending))
+                pending = [chunk for chunk in pending if not chunk.ok]
+                if not pending:
+                    break
+
+        return BulkWriteResult(chunks)
+
     def message_list(self, topic_filter : str) -> dict:
         """Return a list of filter tag topics."""
 
-        response = requests.request(
+        response = self._request(
             "POST",
-            urljoin(self.url, "message/list"),
-            json={"topics": [topic_filter]},
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            "message/list",
+            idempotent=True,
+            json={"topics": [topic_filter]}
         )
 
         if response.ok:
-            return response.json()
+            return self.codec.loads(response.content)
 
         return None
 
 
     # Subscriptions
-    def subscribe(self, app_name: str, callback: str, topic: str) -> str:
-        """Subscibe to a HCC2 message."""
+    def subscribe(self, app_name: str, callback: str, topic: Union[str, List[str]]) -> str:
+        """Subscibe to one or many HCC2 messages with a single callback URI."""
 
         json_data = {
             "callbackAPi": callback, 
-            "topics": [topic],
+            "topics": _topic_list(topic),
             "includeOptional": True}
 
-        response = requests.request(
+        response = self._request(
             "POST",
-            urljoin(self.url, f"message/subscription/{app_name}"),
-            json=json_data,
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout
+            f"message/subscription/{app_name}",
+            json=json_data
         )
 
         if response.ok:
@@ -341,8 +801,26 @@ class RestAPI:
     def unsubscribe(self, app_name: str, topic: str) -> Response:
         """Unsubscribe from a HCC2 message."""
 
-        return requests.request(
+        return self._request(
             "DELETE",
-            urljoin(self.url, f"message/subscription/{app_name}/{topic}"),
-            timeout=self.timeout
+            f"message/subscription/{app_name}/{topic}"
         )
+
+    def unsubscribe_bulk(self, app_name: str, topics: List[str], max_in_flight=None) -> dict[str, bool]:
+        """Unsubscribe from many HCC2 messages concurrently. Returns success by topic."""
+
+        max_in_flight = max_in_flight or AppConfig.rest_pool_maxsize
+
+        def send(topic: str) -> bool:
+            try:
+                return self.unsubscribe(app_name, topic).ok
+            except RequestException as exc:
+                hcc2_logger.debug(f"Unsubscribe {topic} failed: {exc}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            return dict(zip(topics, executor.map(send, topics)))
+
+
+# Release pooled connections on interpreter shutdown
+atexit.register(RestAPI.close)
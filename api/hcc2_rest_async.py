@@ -0,0 +1,436 @@
+"""hcc2_rest_async.py
+
+Asyncio REST API utility class.
+"""
+
+import io
+import os
+import asyncio
+import logging
+from typing import Union, List
+from urllib.parse import urljoin
+
+# Third party
+import aiohttp
+
+# Local
+from api.hcc2_rest import (
+    RestAPI, IDEMPOTENT_METHODS,
+    _topic_list, _message_body, _simple_messages, _complex_messages, _columnar_messages
+)
+from api.hcc2_rest_resilience import CircuitState, CircuitOpenError
+from api.hcc2_rest_schema import (
+    GeneralDataPoint, ConfigDataPoint,
+    SimpleMessage, ComplexMessage
+)
+from api.hcc2_rest_columnar import ColumnarComplexMessage
+from api.hcc2_rest_enums import (
+    TagCategory
+)
+from config import AppConfig
+
+# Logging
+hcc2_logger = logging.getLogger(AppConfig.app_func_name)
+hcc2_logger.propagate = False
+
+
+class AsyncResponse:
+    """A fully read REST response.
+
+    Mirrors the parts of requests.Response used by this project so code
+    checking `response.ok` or `response.status_code` works with either client.
+    """
+
+    __slots__ = ("status_code", "content", "headers")
+
+    def __init__(self, status_code: int, content: bytes, headers: dict):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    @property
+    def ok(self) -> bool:
+        """True if the status code is less than 400."""
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """Response body decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        """Response body decoded as JSON."""
+        return RestAPI.codec.loads(self.content)
+
+
+class AsyncRestAPI:
+    """An asyncio class to interact with the HCC2 REST Server.
+
+    Covers the same surface as RestAPI using coroutines over a pooled aiohttp
+    connector. The number of requests in flight is capped by `max_concurrency`.
+
+    Use as an async context manager, or call open() and close() explicitly.
+    """
+
+    container_version = RestAPI.container_version
+    api_version = RestAPI.api_version
+
+    def __init__(self, version=1, max_concurrency=None):
+        self.version = version
+        self.timeout = 3
+        self.max_concurrency = max_concurrency or AppConfig.rest_async_max_concurrency
+        self._session = None
+        self._semaphore = None
+
+    @property
+    def url(self):
+        """Rest API base URL"""
+        return f'http://{AppConfig.rest_ip}:{AppConfig.rest_port}/api/v{self.version}/'
+
+    async def open(self):
+        """Create the pooled HTTP session."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.max_concurrency
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def close(self):
+        """Close the HTTP session and all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _request(self, method: str, endpoint: str, idempotent=None, **kwargs) -> AsyncResponse:
+        """Send a request to the REST server and read the full response body.
+
+        Shares the RestAPI retry policy, circuit breaker and JSON codec.
+        Non-idempotent requests are only retried if the connection could not
+        be established.
+        """
+        if self._session is None:
+            await self.open()
+        if "json" in kwargs:
+            kwargs["data"] = RestAPI.codec.dumps(kwargs.pop("json"))
+            json_body = True
+        else:
+            json_body = kwargs.pop("json_body", False)
+        if json_body:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        url = urljoin(self.url, endpoint)
+        policy = RestAPI.retry_policy
+        breaker = RestAPI.circuit_breaker
+        attempt = 0
+
+        # Form uploads are consumed when sent and cannot be replayed
+        attempts = 1 if isinstance(kwargs.get("data"), aiohttp.FormData) else policy.attempts
+
+        while True:
+            breaker.before_request()
+            try:
+                async with self._semaphore:
+                    async with self._session.request(method, url, **kwargs) as response:
+                        content = await response.read()
+                        response = AsyncResponse(response.status, content, dict(response.headers))
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                breaker.record_failure()
+                attempt += 1
+                if attempt >= attempts or not (idempotent or isinstance(exc, aiohttp.ClientConnectorError)) or breaker.state == CircuitState.OPEN:
+                    raise
+                hcc2_logger.debug(f"{method} {endpoint} attempt {attempt} failed: {exc}")
+                await asyncio.sleep(policy.backoff(attempt - 1))
+                continue
+
+            except BaseException:
+                breaker.release()
+                raise
+
+            if response.status_code not in policy.retry_statuses:
+                breaker.record_success()
+                return response
+
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= attempts or not idempotent or breaker.state == CircuitState.OPEN:
+                return response
+            await asyncio.sleep(policy.backoff(attempt - 1))
+
+
+    # Ping
+    async def ping(self, attempts=3) -> bool:
+        """Ping for Rest Server life with a provisioning status read."""
+        attempt = 0
+        while attempt < attempts:
+            try:
+                response = await self.check_provisioning_status(AppConfig.app_func_name)
+                if response is not None:
+                    return True
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError, CircuitOpenError):
+                hcc2_logger.error(f"HCC2 Rest server ping attempt {attempt+1} failed!")
+            attempt += 1
+        return False
+
+
+    # Data Points
+    async def create_datapoints(self, app_name: str, tag_type: Union[TagCategory, str], tag_list: List[Union[GeneralDataPoint, ConfigDataPoint, dict]]) -> AsyncResponse:
+        """Create a general or config data point for an application within the app-creator"""
+
+        tag_json = {"tagsList": [topic.to_dict() if isinstance(topic, (GeneralDataPoint, ConfigDataPoint)) else topic for topic in tag_list]}
+
+        return await self._request(
+            "PUT",
+            f"app-creator/{app_name}/datapoint/{tag_type}",
+            json=tag_json
+        )
+
+
+    # Initialize Application
+    async def initialize_app(self, app_name: str) -> AsyncResponse:
+        """Create an empty application."""
+
+        return await self._request(
+            "PUT",
+            f"app-creator/{app_name}/defaults"
+        )
+
+    async def open_app(self, app_name: str, config_file: str) -> AsyncResponse:
+        """Open an application with an existing configuration TAR.GZ file."""
+
+        if not os.path.isfile(config_file):
+            raise FileNotFoundError(f"The configuration file '{config_file}' was not found.")
+
+        with open(config_file, "rb") as file:
+            form = aiohttp.FormData()
+            form.add_field(
+                "appFile",
+                file.read(),
+                filename=f"{AppConfig.app_func_name}.tar.gz",
+                content_type="application/octet-stream"
+            )
+
+        response = await self._request("POST", f"app-creator/{app_name}", data=form)
+        if not response.ok:
+            raise RuntimeError(f"Failed to open app '{app_name}': {response.status_code} {response.text}")
+
+        return response
+
+
+    # Provisioning
+    async def heartbeat_app(self, app_name: str, is_up=True) -> AsyncResponse:
+        """Emit application heartbeat."""
+
+        return await self._request(
+            "PUT",
+            f"app-provision/{app_name}",
+            json={"isUp": is_up}
+        )
+
+    async def provisioning_status(self, app_name: str) -> AsyncResponse:
+        """Fetch the raw provisioning status of an application."""
+
+        return await self._request(
+            "GET",
+            f"app-provision/{app_name}"
+        )
+
+    async def provisioning_result(self, app_name: str, is_valid: bool) -> AsyncResponse:
+        """Post the validation result of a provisioning deployment."""
+
+        return await self._request(
+            "POST",
+            f"app-provision/{app_name}",
+            json={"isValid": is_valid}
+        )
+
+    async def check_provisioning_status(self, app_name: str) -> bool:
+        """Check on the provisioning status of an application."""
+
+        response = await self.provisioning_status(app_name)
+
+        if response.ok:
+            return RestAPI.codec.loads(response.content)["hasNewConfig"]
+
+        return False
+
+    async def get_targz_app(self, app_name: str) -> io.BytesIO:
+        """Fetch provisioning TAR.GZ data. Returns the data as a file object."""
+
+        try:
+            response = await self._request(
+                "GET",
+                f"app-provision/{app_name}/targz"
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+        if not response.ok:
+            return None
+
+        return io.BytesIO(response.content)
+
+
+    # Registration
+    async def register_app(self, app_name: str, config_file=None, is_complex_provisioned=False) -> AsyncResponse:
+        """Register an application with a configuration tar.gz file."""
+
+        query_params = {
+            "isComplexProvisioned": str(is_complex_provisioned).lower()
+        }
+
+        form = None
+        if config_file:
+            with open(config_file, "rb") as file:
+                form = aiohttp.FormData()
+                form.add_field(
+                    "formFile",
+                    file.read(),
+                    filename="config_file",
+                    content_type="application/octet-stream"
+                )
+
+        return await self._request(
+            "POST",
+            f"app-registration/{app_name}",
+            params=query_params,
+            data=form
+        )
+
+
+    # Messages
+    async def message_read_simple(self, topics: List[Union[GeneralDataPoint, ConfigDataPoint, str]]) -> list[SimpleMessage]:
+        """Read any number of simple tag topics. Returns as list of SimpleMessage."""
+
+        response = await self._request(
+            "POST",
+            "message/read",
+            idempotent=True,
+            json={"topics": _topic_list(topics), "includeOptional": True}
+        )
+
+        if response.ok:
+            return _simple_messages(RestAPI.codec.loads(response.content))
+
+        return []
+
+    async def message_read_complex(self, topics: List[str]) -> list[ComplexMessage]:
+        """Read any number of simple or complex tag topics. Returns as list of ComplexMessage."""
+
+        response = await self._request(
+            "POST",
+            "message/read-advanced",
+            idempotent=True,
+            json={"topics": _topic_list(topics)}
+        )
+
+        if response.ok:
+            return _complex_messages(RestAPI.codec.loads(response.content))
+
+        return []
+
+    async def message_read_columnar(self, topics: List[str], data_types: Union[dict, str, None] = None) -> list[ColumnarComplexMessage]:
+        """Read any number of simple or complex tag topics. Returns as list of ColumnarComplexMessage."""
+
+        response = await self._request(
+            "POST",
+            "message/read-advanced",
+            idempotent=True,
+            json={"topics": _topic_list(topics)}
+        )
+
+        if response.ok:
+            return _columnar_messages(RestAPI.codec.loads(response.content), data_types)
+
+        return []
+
+    async def message_write_simple(self, topics: Union[List[Union[SimpleMessage, dict]], bytes]) -> AsyncResponse:
+        """Write any number of simple tag topics. Accepts pre-encoded JSON bytes."""
+
+        return await self._request(
+            "POST",
+            "message/write",
+            idempotent=True,
+            **_message_body(topics, (SimpleMessage,))
+        )
+
+    async def message_write_complex(self, topics: Union[List[Union[SimpleMessage, ComplexMessage, ColumnarComplexMessage, dict]], bytes]) -> AsyncResponse:
+        """Write any number of simple or complex tag topics. Accepts pre-encoded JSON bytes."""
+
+        return await self._request(
+            "POST",
+            "message/write-advanced",
+            idempotent=True,
+            **_message_body(topics, (SimpleMessage, ComplexMessage, ColumnarComplexMessage))
+        )
+
+    async def message_list(self, topic_filter : str) -> dict:
+        """Return a list of filter tag topics."""
+
+        response = await self._request(
+            "POST",
+            "message/list",
+            idempotent=True,
+            json={"topics": [topic_filter]}
+        )
+
+        if response.ok:
+            return RestAPI.codec.loads(response.content)
+
+        return None
+
+
+    # Subscriptions
+    async def subscribe(self, app_name: str, callback: str, topic: Union[str, List[str]]) -> str:
+        """Subscibe to one or many HCC2 messages with a single callback URI."""
+
+        json_data = {
+            "callbackAPi": callback,
+            "topics": _topic_list(topic),
+            "includeOptional": True}
+
+        response = await self._request(
+            "POST",
+            f"message/subscription/{app_name}",
+            json=json_data
+        )
+
+        if response.ok:
+            return callback
+
+        return ""
+
+    async def unsubscribe(self, app_name: str, topic: str) -> AsyncResponse:
+        """Unsubscribe from a HCC2 message."""
+
+        return await self._request(
+            "DELETE",
+            f"message/subscription/{app_name}/{topic}"
+        )
+
+    async def unsubscribe_bulk(self, app_name: str, topics: List[str]) -> dict[str, bool]:
+        """Unsubscribe from many HCC2 messages concurrently. Returns success by topic."""
+
+        async def send(topic: str) -> bool:
+            try:
+                return (await self.unsubscribe(app_name, topic)).ok
+            except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as exc:
+                hcc2_logger.debug(f"Unsubscribe {topic} failed: {exc}")
+                return False
+
+        return dict(zip(topics, await asyncio.gather(*(send(topic) for topic in topics))))
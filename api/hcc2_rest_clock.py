@@ -0,0 +1,45 @@
+"""hcc2_rest_clock.py
+
+Epoch millisecond clock used to timestamp REST messages.
+"""
+
+import time
+
+
+class EpochClock:
+    """Low overhead epoch millisecond clock.
+
+    HCC2 message timestamps are epoch milliseconds as strings. The string of
+    the current millisecond is cached, so messages created within the same
+    millisecond share one string instead of each formatting a new one.
+    """
+
+    __slots__ = ("_last",)
+
+    def __init__(self):
+        # (milliseconds, string) replaced as a whole so readers never see a torn pair
+        self._last = (0, "0")
+
+    @staticmethod
+    def ms() -> int:
+        """Current epoch time in milliseconds."""
+        return time.time_ns() // 1_000_000
+
+    def now(self) -> str:
+        """Current epoch time in milliseconds as a timestamp string."""
+        ms = time.time_ns() // 1_000_000
+        last = self._last
+        if last[0] == ms:
+            return last[1]
+
+        stamp = str(ms)
+        self._last = (ms, stamp)
+        return stamp
+
+    def stamps(self, count: int) -> list[str]:
+        """One timestamp string read once and repeated `count` times, for array values."""
+        return [self.now()] * count
+
+
+# Shared clock for all schema objects
+epoch_clock = EpochClock()
@@ -0,0 +1,228 @@
+"""hcc2_rest_columnar.py
+
+Columnar multi-tag message schemas.
+"""
+
+import array
+from dataclasses import dataclass, field
+from typing import Any, Union, Optional
+
+# Third party (Optional)
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local
+from config import AppConfig
+from api.hcc2_rest_enums import TagDataType, MessageQuality
+from api.hcc2_rest_schema import Schema, DataPoint, ComplexMessage
+
+
+# Ignore camel case dataclass fields naming complaints.
+# pylint: disable=C0103
+
+# Typed array element per tag data type, (NumPy dtype, array module typecode)
+_ARRAY_TYPES = {
+    TagDataType.BOOL: ("bool", "B"),
+    TagDataType.UINT8: ("uint8", "B"),
+    TagDataType.UINT16: ("uint16", "H"),
+    TagDataType.UINT32: ("uint32", "I"),
+    TagDataType.UINT64: ("uint64", "Q"),
+    TagDataType.INT8: ("int8", "b"),
+    TagDataType.INT16: ("int16", "h"),
+    TagDataType.INT32: ("int32", "i"),
+    TagDataType.INT64: ("int64", "q"),
+    TagDataType.FLOAT: ("float32", "f"),
+    TagDataType.DOUBLE: ("float64", "d"),
+}
+
+# Backend used for typed arrays
+backend = "numpy" if numpy is not None else "array"
+
+
+def infer_data_type(values: list) -> str:
+    """Guess the tag data type of a list of JSON values. Strings and mixed values are JSON."""
+
+    if all(isinstance(v, bool) for v in values):
+        return TagDataType.BOOL
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return TagDataType.INT64
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return TagDataType.DOUBLE
+    return TagDataType.JSON
+
+
+def typed_array(values: list, data_type: str):
+    """Convert a list of values to a typed array for numeric and Bool tag types.
+
+    Returns a NumPy array if NumPy is installed, else an `array` module array.
+    Values of other tag types, or values that do not fit the type, are
+    returned as a list.
+    """
+
+    types = _ARRAY_TYPES.get(data_type)
+    if types is None:
+        return list(values)
+
+    try:
+        if numpy is not None:
+            return numpy.asarray(values, dtype=types[0])
+        return array.array(types[1], values)
+    except (TypeError, ValueError, OverflowError):
+        return list(values)
+
+
+def timestamp_array(timestamps: list):
+    """Convert wire timestamps (epoch ms strings) to an int64 array."""
+
+    stamps = [int(t) for t in timestamps]
+    if numpy is not None:
+        return numpy.asarray(stamps, dtype="int64")
+    return array.array("q", stamps)
+
+
+def _tolist(values, data_type=None) -> list:
+    if data_type == TagDataType.BOOL and isinstance(values, array.array):
+        # `array` module has no bool typecode, values are stored as 0 or 1
+        return [bool(v) for v in values]
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+@dataclass(slots=True)
+class ColumnarDataPoint(Schema):
+    """
+    A multi-tag data point with values and timestamps in typed arrays.
+
+    Attributes:
+    -----------
+    dataPointName: str
+        Name of the sub-tag topic.
+    values: Any
+        Values as a typed array for numeric and Bool tags, else a list.
+    quality: int
+        Quality of the data point message.
+    timeStamps: Any
+        Epoch millisecond timestamps as an int64 array.
+    dataType: str
+        Tag data type used to choose the array type.
+    """
+    dataPointName: str
+    values: Any
+    quality: int = MessageQuality.GOOD
+    timeStamps: Any = None
+    dataType: str = TagDataType.DOUBLE
+
+    @classmethod
+    def from_wire(cls, data: dict, data_type: Optional[str] = None) -> "ColumnarDataPoint":
+        """Create from a wire format data point dict. The data type is inferred if not given."""
+        values = data.get("values", [])
+        data_type = data_type or infer_data_type(values)
+        return cls(
+            data["dataPointName"],
+            typed_array(values, data_type),
+            data.get("quality", MessageQuality.GOOD),
+            timestamp_array(data.get("timeStamps", [])),
+            data_type
+        )
+
+    @classmethod
+    def from_datapoint(cls, datapoint: DataPoint, data_type: Optional[str] = None) -> "ColumnarDataPoint":
+        """Create from a DataPoint. The data type is inferred if not given."""
+        data_type = data_type or infer_data_type(datapoint.values)
+        return cls(
+            datapoint.dataPointName,
+            typed_array(datapoint.values, data_type),
+            datapoint.quality,
+            timestamp_array(datapoint.timeStamps),
+            data_type
+        )
+
+    def to_datapoint(self) -> DataPoint:
+        """Convert back to a DataPoint of Python values."""
+        return DataPoint(self.dataPointName, _tolist(self.values, self.dataType), self.quality, [str(t) for t in _tolist(self.timeStamps)])
+
+    def to_dict(self) -> dict:
+        """Return the wire format dict."""
+        return {
+            "dataPointName": self.dataPointName,
+            "values": _tolist(self.values, self.dataType),
+            "quality": self.quality,
+            "timeStamps": [str(t) for t in _tolist(self.timeStamps)]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnarDataPoint":
+        """Create from a wire format data point dict."""
+        return cls.from_wire(data)
+
+
+@dataclass(slots=True)
+class ColumnarComplexMessage(Schema):
+    """
+    A multi-tag message with each data point held in typed arrays.
+
+    Attributes:
+    -----------
+    topic: str
+        Multi-tag topic name.
+    datapoints: List[ColumnarDataPoint]
+        Columnar data points within the multi-tag message.
+    msgSource: str
+        Source application of the message.
+    """
+    topic: str
+    datapoints: list = field(default_factory=list)
+    msgSource: str = AppConfig.app_func_name
+
+    @classmethod
+    def from_wire(cls, data: dict, data_types: Union[dict, str, None] = None) -> "ColumnarComplexMessage":
+        """Create from a wire format message dict.
+
+        `data_types` is one tag data type for all data points, or a dict of
+        data point name to tag data type. Missing types are inferred.
+        """
+        return cls(
+            data["topic"],
+            [ColumnarDataPoint.from_wire(dp, _data_type(data_types, dp["dataPointName"])) for dp in data.get("datapoints", [])],
+            data.get("msgSource", AppConfig.app_func_name)
+        )
+
+    @classmethod
+    def from_message(cls, message: ComplexMessage, data_types: Union[dict, str, None] = None) -> "ColumnarComplexMessage":
+        """Create from a ComplexMessage. See from_wire for `data_types`."""
+        return cls(
+            message.topic,
+            [ColumnarDataPoint.from_datapoint(dp, _data_type(data_types, dp.dataPointName)) for dp in message.datapoints],
+            message.msgSource
+        )
+
+    def to_message(self) -> ComplexMessage:
+        """Convert back to a ComplexMessage of Python values."""
+        return ComplexMessage(self.topic, [dp.to_datapoint() for dp in self.datapoints], self.msgSource)
+
+    def datapoint(self, name: str) -> ColumnarDataPoint:
+        """Return a data point by name, None if not found."""
+        for dp in self.datapoints:
+            if dp.dataPointName == name:
+                return dp
+        return None
+
+    def to_dict(self) -> dict:
+        """Return the wire format dict."""
+        return {
+            "topic": self.topic,
+            "datapoints": [dp.to_dict() for dp in self.datapoints],
+            "msgSource": self.msgSource
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnarComplexMessage":
+        """Create from a wire format message dict."""
+        return cls.from_wire(data)
+
+
+def _data_type(data_types: Union[dict, str, None], name: str) -> Optional[str]:
+    if isinstance(data_types, dict):
+        return data_types.get(name)
+    return data_types
@@ -0,0 +1,127 @@
+"""hcc2_rest_decode.py
+
+Per-topic conversion of message values to native types from tag metadata.
+"""
+
+import threading
+from typing import Any, Callable
+
+# Local
+from config import AppConfig
+from api.hcc2_rest_enums import TagDataType
+from api.hcc2_rest_schema import json_codec
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1")
+    return bool(value)
+
+
+def _to_int(value) -> int:
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        # Integers sent as decimal strings, ie "12.0"
+        return int(float(value))
+
+
+def _to_json(value) -> Any:
+    if isinstance(value, (str, bytes)):
+        return json_codec.loads(value)
+    return value
+
+
+# Value converter per tag data type
+_DECODERS = {
+    TagDataType.BOOL: _to_bool,
+    TagDataType.UINT8: _to_int,
+    TagDataType.UINT16: _to_int,
+    TagDataType.UINT32: _to_int,
+    TagDataType.UINT64: _to_int,
+    TagDataType.INT8: _to_int,
+    TagDataType.INT16: _to_int,
+    TagDataType.INT32: _to_int,
+    TagDataType.INT64: _to_int,
+    TagDataType.FLOAT: float,
+    TagDataType.DOUBLE: float,
+    TagDataType.STRING: str,
+    TagDataType.JSON: _to_json,
+    TagDataType.ENUM: _to_int,
+    TagDataType.TAG: str,
+}
+
+# metadata.json data types are not always cased like TagDataType
+_DATA_TYPES = {data_type.lower(): data_type for data_type in _DECODERS}
+
+
+def decoder(data_type: str) -> Callable:
+    """Return the value converter of a tag data type, None if unknown."""
+    data_type = _DATA_TYPES.get(str(data_type).lower())
+    return _DECODERS.get(data_type)
+
+
+class ValueDecoders:
+    """Table of value converters keyed by tag topic FQN.
+
+    Built once as data points are registered, then used to convert message
+    values at ingest so readers get Bool, int, float or decoded JSON values
+    instead of raw JSON values. Array tag values are converted element wise.
+    Values that fail to convert, and topics without a converter, are left as
+    they arrived.
+    """
+
+    def __init__(self):
+        self._decoders = {}
+        self._data_types = {}
+        self._lock = threading.Lock()
+
+    def register(self, topic: str, data_type: str):
+        """Add or replace the converter of a topic FQN. Unknown data types are ignored."""
+        convert = decoder(data_type)
+        if convert is None:
+            return
+
+        with self._lock:
+            # Replace whole tables so lookups on other threads never lock
+            self._decoders = {**self._decoders, topic: convert}
+            self._data_types = {**self._data_types, topic: _DATA_TYPES[str(data_type).lower()]}
+
+    def register_datapoint(self, datapoint):
+        """Add the converter of a GeneralDataPoint or ConfigDataPoint from its metadata."""
+        self.register(datapoint.fqn, datapoint.metadata.dataType)
+
+    def unregister(self, topic: str):
+        """Remove the converter of a topic FQN."""
+        with self._lock:
+            self._decoders = {t: d for t, d in self._decoders.items() if t != topic}
+            self._data_types = {t: d for t, d in self._data_types.items() if t != topic}
+
+    def data_type(self, topic: str) -> str:
+        """Registered tag data type of a topic FQN, None if not registered."""
+        return self._data_types.get(topic)
+
+    def decode(self, topic: str, value):
+        """Convert a value of a topic to its native type."""
+        convert = self._decoders.get(topic)
+        if convert is None or value is None or not AppConfig.rest_typed_values:
+            return value
+
+        try:
+            if isinstance(value, list):
+                return [convert(v) for v in value]
+            return convert(value)
+        except (TypeError, ValueError):
+            return value
+
+    def __contains__(self, topic):
+        return topic in self._decoders
+
+    def __len__(self):
+        return len(self._decoders)
+
+
+# Shared table, filled as data points are added to DataPoints
+value_decoders = ValueDecoders()
@@ -0,0 +1,148 @@
+"""hcc2_rest_resilience.py
+
+Retry policy and circuit breaker used by the REST API classes.
+"""
+
+import time
+import random
+import threading
+
+# Third party
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+
+class CircuitState():
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RequestsConnectionError):
+    """Raised without contacting the REST server while the circuit breaker is open.
+
+    Subclasses requests ConnectionError so existing connection error handling
+    treats a fast failure the same as a refused connection.
+    """
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Attributes:
+    -----------
+    attempts: int
+        Total attempts per request, including the first.
+    base_delay: float
+        Backoff delay in seconds before the second attempt.
+    max_delay: float
+        Upper bound of any single backoff delay in seconds.
+    retry_statuses: frozenset
+        HTTP status codes retried for idempotent requests.
+    """
+
+    def __init__(self, attempts=3, base_delay=0.1, max_delay=2.0, retry_statuses=(502, 503, 504)):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, attempt: int, max_delay=None) -> float:
+        """Return a jittered delay in seconds before retry number `attempt` (0 based)."""
+        cap = self.max_delay if max_delay is None else max_delay
+        return random.uniform(0, min(cap, self.base_delay * (2 ** min(attempt, 32))))
+
+
+class CircuitBreaker:
+    """Thread safe circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast with CircuitOpenError. Once `reset_timeout` seconds
+    have passed a single probe request is let through (half open). A
+    successful probe closes the circuit, a failed one opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=5.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Metrics
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current circuit state."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == CircuitState.OPEN and (time.monotonic() - self._opened_at) >= self.reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def before_request(self):
+        """Raise CircuitOpenError if a request must not be sent now."""
+        with self._lock:
+            state = self._current_state()
+
+            if state == CircuitState.CLOSED:
+                return
+
+            if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            self.total_rejected += 1
+            raise CircuitOpenError("HCC2 REST server circuit breaker is open.")
+
+    def record_success(self):
+        """Record a request that reached the REST server."""
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self):
+        """Record a request that failed to reach the REST server."""
+        with self._lock:
+            self._failures += 1
+            self.total_failures += 1
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+
+            if was_probe or (self._state == CircuitState.CLOSED and self._failures >= self.failure_threshold):
+                if self._state != CircuitState.OPEN:
+                    self.times_opened += 1
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """Release a probe slot taken by a request that ended without a verdict."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe request is allowed, 0 if requests are allowed now."""
+        with self._lock:
+            if self._current_state() != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def metrics(self) -> dict:
+        """Return breaker state and counters."""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "total_failures": self.total_failures,
+                "total_rejected": self.total_rejected,
+                "times_opened": self.times_opened
+            }
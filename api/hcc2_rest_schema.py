@@ -4,12 +4,19 @@ Dataclasses of REST schemas.
 """
 
 import json
-from datetime import datetime
-from typing import Union, List, Any, Type, TypeVar
-from dataclasses import dataclass, asdict, field
+from typing import Union, List, Any, Type, TypeVar, get_origin, get_args
+from dataclasses import dataclass, field, fields
+
+# Third party (Optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Local
 from config import AppConfig
+from api.hcc2_rest_clock import epoch_clock
+from api.hcc2_rest_topics import topic_registry
 from api.hcc2_rest_enums import (
     UnitType, TagDataType, TagSubClass, MessageQuality
 )
@@ -18,27 +25,86 @@ from api.hcc2_rest_enums import (
 # Ignore camel case dataclass fields naming complaints.
 # pylint: disable=C0103
 
+class StdlibJsonCodec:
+    """JSON codec backed by the standard library json module."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        """Encode an object to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON bytes or string."""
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """JSON codec backed by orjson.
+
+    Objects orjson cannot encode (ie integers above 64 bits) fall back to the
+    standard library encoder.
+    """
+
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        """Encode an object to compact UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            return StdlibJsonCodec.dumps(obj)
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON bytes or string."""
+        return orjson.loads(data)
+
+
+# Fastest JSON codec installed. REST payloads are encoded and decoded through this.
+json_codec = OrjsonCodec if orjson is not None else StdlibJsonCodec
+
+
+def internal(default=None):
+    """Dataclass field derived in __post_init__ and left out of the REST payload."""
+    return field(default=default, init=False, repr=False, compare=False, metadata={"internal": True})
+
+
 T = TypeVar('T', bound='Schema')
 class Schema:
-    """API schema utility function base dataclass."""
+    """API schema utility function base dataclass.
+
+    Schemas are slotted dataclasses, instances have no __dict__ and all
+    attributes must be declared as fields.
+
+    to_dict and from_dict dispatch to serializers generated for the exact
+    schema class, see compile_schema.
+    """
+
+    __slots__ = ()
 
     def to_dict(self) -> dict:
         """Return dataclass as dict."""
-        return asdict(self)
+        serializers = _serializers.get(type(self)) or _compile(type(self))
+        return serializers[0](self)
 
     @classmethod
     def from_dict(cls: Type[T], data: dict) -> T:
         """Create an instance of the schema from a dictionary."""
-        return cls(**data)
+        serializers = _serializers.get(cls) or _compile(cls)
+        return serializers[1](cls, data)
 
     def to_json(self) -> str:
         """Convert the schema to a JSON string."""
-        return json.dumps(self.to_dict())
+        return json_codec.dumps(self.to_dict()).decode("utf-8")
 
     @classmethod
-    def from_json(cls: Type[T], json_str: str) -> T:
-        """Create an instance of the schema from a JSON string."""
-        return cls.from_dict(json.loads(json_str))
+    def from_json(cls: Type[T], json_str: Union[str, bytes]) -> T:
+        """Create an instance of the schema from a JSON string or bytes."""
+        return cls.from_dict(json_codec.loads(json_str))
 
     def update(self, **kwargs):
         """Update schema data with new values."""
@@ -51,7 +117,7 @@ class Schema:
         return self.__class__.__name__
 
 
-@dataclass
+@dataclass(slots=True)
 class TagMetadata(Schema):
     """
     Represents metadata for a config or general data point.
@@ -88,7 +154,7 @@ class TagMetadata(Schema):
     arraySize: str = "1"
 
 
-@dataclass
+@dataclass(slots=True)
 class TagUnityUI(Schema):
     """
     Represents Unity UI configuration for an application tag.
@@ -123,7 +189,7 @@ class TagUnityUI(Schema):
             raise ValueError("shortDisplayName must be 16 characters or fewer")
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneralDataPoint(Schema):
     """
     General data point class.
@@ -147,12 +213,19 @@ class GeneralDataPoint(Schema):
     # Meaningless for General DPs but required by REST
     defaultValue: str = "0"
 
+    # Derived
+    is_multitag: bool = internal(False)
+    prefix: str = internal("")
+    fqn: str = internal("")
+    topic_id: int = internal(0)
+    value: Any = internal()
+
     def __post_init__(self):
-        self.is_multitag = self.topic.endswith("|.")
         self.prefix = f'liveValue.{self.tagSubClass}.this.{AppConfig.app_func_name}.0.'
-        self.fqn = self.topic if self.topic.startswith(self.prefix) else f'{self.prefix}{self.topic}'
-        if not self.fqn.endswith('.'):
-            self.fqn = self.fqn + '.'
+        info = topic_registry.resolve(self.topic, self.prefix)
+        self.is_multitag = info.is_multitag
+        self.fqn = info.fqn
+        self.topic_id = info.id
 
         self.defaultValue = '0'
         self.value = None
@@ -161,7 +234,7 @@ class GeneralDataPoint(Schema):
         return self.fqn
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigDataPoint(Schema):
     """
     Configuration data point class.
@@ -185,12 +258,19 @@ class ConfigDataPoint(Schema):
     # Meaningless for Config DPs but required by REST
     tagSubClass: str = TagSubClass.PRODUCTION
 
+    # Derived
+    is_multitag: bool = internal(False)
+    prefix: str = internal("")
+    fqn: str = internal("")
+    topic_id: int = internal(0)
+    value: Any = internal()
+
     def __post_init__(self):
-        self.is_multitag = self.topic.endswith("|.")
         self.prefix = f'liveValue.postvalidConfig.this.{AppConfig.app_func_name}.0.'
-        self.fqn = self.topic if self.topic.startswith(self.prefix) else f'{self.prefix}{self.topic}'
-        if not self.fqn.endswith('.'):
-            self.fqn = self.fqn + '.'
+        info = topic_registry.resolve(self.topic, self.prefix)
+        self.is_multitag = info.is_multitag
+        self.fqn = info.fqn
+        self.topic_id = info.id
 
         self.tagSubClass = TagSubClass.PRODUCTION
         self.value = None
@@ -199,7 +279,7 @@ class ConfigDataPoint(Schema):
         return self.fqn
 
 
-@dataclass
+@dataclass(slots=True)
 class SimpleMessage(Schema):
     """
     Represents a single tag message with associated value and metadata.
@@ -221,10 +301,10 @@ class SimpleMessage(Schema):
     value: Any
     msgSource: str = AppConfig.app_func_name
     quality: int = MessageQuality.GOOD
-    timeStamp: str = str(int(datetime.now().timestamp() * 1000))
+    timeStamp: str = field(default_factory=epoch_clock.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class DataPoint(Schema):
     """
     Represents a sub-tag topic within a multi-tag message.
@@ -253,10 +333,10 @@ class DataPoint(Schema):
 
             # Create list of current timestamp
             if not self.timeStamps:
-                self.timeStamps = [str(int(datetime.now().timestamp() * 1000))] * len(self.values)
+                self.timeStamps = epoch_clock.stamps(len(self.values))
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplexMessage(Schema):
     """
     Represents a multi-tag message containing an array of DataPoints.
@@ -273,3 +353,93 @@ class ComplexMessage(Schema):
     topic: str
     datapoints: List[DataPoint]
     msgSource: str = AppConfig.app_func_name
+
+
+# Generated serializers
+def _to_value(value):
+    return value.to_dict() if isinstance(value, Schema) else value
+
+
+def _to_values(values):
+    return [v.to_dict() if isinstance(v, Schema) else v for v in values] if isinstance(values, list) else values
+
+
+def _nested_schema(field_type) -> tuple[bool, type]:
+    """Return (is_list, schema class) of a field holding schemas, (False, None) otherwise."""
+
+    if isinstance(field_type, type) and issubclass(field_type, Schema):
+        return False, field_type
+
+    args = get_args(field_type)
+    if get_origin(field_type) is list and args and isinstance(args[0], type) and issubclass(args[0], Schema):
+        return True, args[0]
+
+    return False, None
+
+
+# Generated (to_dict, from_dict) functions keyed by exact schema class
+_serializers = {}
+
+
+def compile_schema(cls: Type[T]) -> Type[T]:
+    """Generate specialized to_dict and from_dict functions for a schema dataclass.
+
+    to_dict builds the payload dict with one literal, converting nested
+    schemas but without deep copying lists or values like dataclasses.asdict.
+    Internal fields are left out. from_dict converts nested dicts back to
+    their schema classes.
+
+    The functions are kept per class rather than set on it, so subclasses
+    are not served their parent's serializers and get their own fields.
+    """
+    _compile(cls)
+    return cls
+
+
+def _compile(cls) -> tuple:
+
+    namespace = {"_to_value": _to_value, "_to_values": _to_values}
+    items = []
+    conversions = []
+
+    for f in fields(cls):
+        if f.metadata.get("internal"):
+            continue
+
+        is_list, schema = _nested_schema(f.type)
+        if schema is None:
+            items.append(f"{f.name!r}: self.{f.name}")
+            continue
+
+        namespace[schema.__name__] = schema
+        if is_list:
+            items.append(f"{f.name!r}: _to_values(self.{f.name})")
+            conversions.append(
+                f"    if isinstance(_v := data.get({f.name!r}), list):\n"
+                f"        kwargs[{f.name!r}] = [{schema.__name__}.from_dict(i) if isinstance(i, dict) else i for i in _v]"
+            )
+        else:
+            items.append(f"{f.name!r}: _to_value(self.{f.name})")
+            conversions.append(
+                f"    if isinstance(_v := data.get({f.name!r}), dict):\n"
+                f"        kwargs[{f.name!r}] = {schema.__name__}.from_dict(_v)"
+            )
+
+    source = "def to_dict(self):\n    return {" + ", ".join(items) + "}\n\n"
+    if conversions:
+        source += "def from_dict(cls, data):\n    kwargs = dict(data)\n" + "\n".join(conversions) + "\n    return cls(**kwargs)\n"
+    else:
+        source += "def from_dict(cls, data):\n    return cls(**data)\n"
+
+    exec(compile(source, f"<{cls.__name__} serializers>", "exec"), namespace)
+
+    for name in ("to_dict", "from_dict"):
+        namespace[name].__qualname__ = f"{cls.__name__}.{name}"
+
+    serializers = (namespace["to_dict"], namespace["from_dict"])
+    _serializers[cls] = serializers
+    return serializers
+
+
+for _schema in (TagMetadata, TagUnityUI, GeneralDataPoint, ConfigDataPoint, SimpleMessage, DataPoint, ComplexMessage):
+    compile_schema(_schema)
@@ -0,0 +1,135 @@
+"""hcc2_rest_topics.py
+
+Registry of interned tag topic FQNs with integer topic IDs.
+"""
+
+import sys
+import threading
+
+
+class TopicInfo:
+    """Precomputed details of a registered tag topic.
+
+    Attributes:
+    -----------
+    id: int
+        Compact topic ID, the registration order of the topic.
+    fqn: str
+        Interned fully qualified topic name.
+    prefix: str
+        Live value prefix (liveValue.<subclass>.this.<app>.0.), empty if the topic has none.
+    name: str
+        Topic name after the prefix.
+    is_multitag: bool
+        True for multi-tag topics (|. suffix).
+    """
+
+    __slots__ = ("id", "fqn", "prefix", "name", "is_multitag")
+
+    def __init__(self, topic_id: int, fqn: str):
+        self.id = topic_id
+        self.fqn = fqn
+        self.is_multitag = fqn.endswith("|.")
+
+        parts = fqn.split(".", 5)
+        if fqn.startswith("liveValue.") and len(parts) == 6:
+            self.prefix = sys.intern(".".join(parts[:5]) + ".")
+            self.name = parts[5]
+        else:
+            self.prefix = ""
+            self.name = fqn
+
+    def __repr__(self):
+        return f"TopicInfo(id={self.id}, fqn={self.fqn!r})"
+
+
+class TopicRegistry:
+    """Process wide table of tag topics.
+
+    Every FQN is interned once and given a small integer ID, so tables keyed
+    by topic share one string object per topic and hot paths can key on IDs.
+    Topics are never removed, IDs stay valid for the life of the process, so
+    the registry grows with the number of distinct topics used. Lookups do
+    not lock.
+
+    Attributes:
+    -----------
+    resolved_capacity: int
+        Maximum (prefix, topic) pairs cached by resolve. The cache is cleared
+        when full, the registered topics are kept.
+    """
+
+    def __init__(self, resolved_capacity=65536):
+        self.resolved_capacity = resolved_capacity
+        self._lock = threading.Lock()
+        self._by_fqn = {}
+        self._by_id = []
+        self._resolved = {}
+
+    def intern(self, fqn: str) -> TopicInfo:
+        """Return the TopicInfo of an FQN, registering it if new."""
+        info = self._by_fqn.get(fqn)
+        if info is not None:
+            return info
+
+        with self._lock:
+            info = self._by_fqn.get(fqn)
+            if info is None:
+                info = TopicInfo(len(self._by_id), sys.intern(fqn))
+                self._by_id.append(info)
+                self._by_fqn[info.fqn] = info
+            return info
+
+    def resolve(self, topic: str, prefix: str) -> TopicInfo:
+        """Return the TopicInfo of a topic under a prefix, registering it if new.
+
+        The prefix is added unless the topic already starts with it, and a
+        trailing '.' is added if missing. Built FQNs are cached, up to
+        `resolved_capacity` pairs.
+        """
+        key = (prefix, topic)
+        info = self._resolved.get(key)
+        if info is not None:
+            return info
+
+        info = self.intern(self.normalize(topic, prefix))
+        if len(self._resolved) >= self.resolved_capacity:
+            # Swap in a new table so lookups on other threads never see it shrink
+            self._resolved = {}
+        self._resolved[key] = info
+        return info
+
+    @staticmethod
+    def normalize(topic: str, prefix: str = "") -> str:
+        """Return the FQN form of a topic without registering it.
+
+        Surrounding whitespace is removed, the prefix added unless the topic
+        already starts with it and a trailing '.' added if missing.
+        """
+        topic = topic.strip()
+        fqn = topic if topic.startswith(prefix) else f'{prefix}{topic}'
+        if not fqn.endswith('.'):
+            fqn = fqn + '.'
+        return fqn
+
+    def get(self, fqn: str) -> TopicInfo:
+        """Return the TopicInfo of an FQN, None if not registered."""
+        return self._by_fqn.get(fqn)
+
+    def id(self, fqn: str) -> int:
+        """Return the topic ID of an FQN, None if not registered."""
+        info = self._by_fqn.get(fqn)
+        return info.id if info is not None else None
+
+    def __getitem__(self, topic_id: int) -> TopicInfo:
+        return self._by_id[topic_id]
+
+    def __contains__(self, fqn):
+        return fqn in self._by_fqn
+
+    def __len__(self):
+        return len(self._by_id)
+
+
+# Shared registry of all topics used by the application
+topic_registry = TopicRegistry()
@@ -21,6 +21,7 @@ This is template code for a python HCC2 user application. This application can,
 import os
 import sys
 import time
+import atexit
 import logging
 import threading
 from abc import ABC, abstractmethod
@@ -182,6 +183,11 @@ def app():
     hcc2_logger.info(f"{AppConfig.app_name} IP: {AppConfig.app_ip}")
     rest_api = RestAPI()
 
+    # Merge concurrent message reads from all tasks
+    if AppConfig.rest_read_coalesce_window > 0:
+        RestAPI.enable_read_coalescing()
+        hcc2_logger.info(f"REST Read Coalescing Window: {AppConfig.rest_read_coalesce_window * 1000:.0f} ms")
+
     # Check Port 7071 is Open (REST API Port)
     if not rest_api.is_port_open():
         hcc2_logger.critical(f"Port 7071 is not open on {AppConfig.rest_ip}")
@@ -226,6 +232,9 @@ def app():
     if not Provisioning.is_provisioned:
         info_banner("Waiting On Provisioning Data")
 
+    # Unsubscribe and stop the webhook listeners, dispatcher and supervisor on exit
+    atexit.register(Subscriptions.shutdown)
+
     # Init task classes
     try:
         task1 = Task1()
@@ -240,6 +249,7 @@ def app():
 
         task1.stop()
         task2.stop()
+        Subscriptions.shutdown()
 
         time.sleep(10) # Prevent rapid restarting on error
         sys.exit(ExitCode.UNEXPECTED_ERROR)
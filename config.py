@@ -47,6 +47,9 @@ class AppConfig:
     provisioning_complex = config["provisioning"]["complex"]
     provisioning_exit_if_failed = False
     provisioning_poll = 1
+    provisioning_stream_targz = config["provisioning"]["stream_targz"]
+    provisioning_spool_bytes = config["provisioning"]["spool_bytes"]
+    provisioning_spool_dir = config["provisioning"]["spool_dir"]
 
     # Network
     rest_ip = None
@@ -56,6 +59,39 @@ class AppConfig:
     rest_port = config["rest_api"]["port"]
     rest_version = config["rest_api"]["version"]
     rest_verify_ssl = False
+    rest_pool_connections = config["rest_api"]["pool_connections"]
+    rest_pool_maxsize = config["rest_api"]["pool_maxsize"]
+    rest_pool_block = config["rest_api"]["pool_block"]
+    rest_async_max_concurrency = config["rest_api"]["async_max_concurrency"]
+    rest_read_coalesce_window = config["rest_api"]["read_coalesce_window_ms"] / 1000
+    rest_read_coalesce_max_topics = config["rest_api"]["read_coalesce_max_topics"]
+    rest_retry_attempts = config["rest_api"]["retry_attempts"]
+    rest_retry_backoff = config["rest_api"]["retry_backoff_ms"] / 1000
+    rest_retry_backoff_max = config["rest_api"]["retry_backoff_max_ms"] / 1000
+    rest_breaker_failure_threshold = config["rest_api"]["breaker_failure_threshold"]
+    rest_breaker_reset_timeout = config["rest_api"]["breaker_reset_timeout"]
+    rest_bulk_chunk_size = config["rest_api"]["bulk_chunk_size"]
+    rest_bulk_chunk_bytes = config["rest_api"]["bulk_chunk_bytes"]
+    rest_bulk_max_in_flight = config["rest_api"]["bulk_max_in_flight"]
+    rest_bulk_retries = config["rest_api"]["bulk_retries"]
+    rest_typed_values = config["rest_api"]["typed_values"]
+
+    # Subscriptions
+    subscription_listeners = config["subscriptions"]["listeners"]
+    subscription_engine = config["subscriptions"]["engine"]
+    subscription_buffer_capacity = config["subscriptions"]["buffer_capacity"]
+    # "block" holds the listener thread, back-pressuring every topic it serves
+    subscription_overflow_policy = config["subscriptions"]["overflow_policy"]
+    subscription_block_timeout = config["subscriptions"]["block_timeout_ms"] / 1000
+    subscription_callback_workers = config["subscriptions"]["callback_workers"]
+    subscription_batch_size = config["subscriptions"]["batch_size"]
+    subscription_pattern_refresh_interval = config["subscriptions"]["pattern_refresh_interval"]
+    subscription_pattern_cache_ttl = config["subscriptions"]["pattern_cache_ttl"]
+    subscription_watchdog = config["subscriptions"]["watchdog"]
+    subscription_expected_interval = config["subscriptions"]["expected_interval"]
+    subscription_stale_factor = config["subscriptions"]["stale_factor"]
+    subscription_history_capacity = config["subscriptions"]["history_capacity"]
+    subscription_lazy_parsing = config["subscriptions"]["lazy_parsing"]
 
     def __setattr__(self, name, value):
         raise AttributeError("Configuration class is read-only.")
@@ -14,6 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # Local
 from app import Task
 from config import AppConfig
+from api import TagDataType, value_decoders
 from services import Subscriptions
 
 # Logging
@@ -29,7 +30,7 @@ class MonitorIOChannels(Task):
     """Subscribe and monitor HCC2 IO channels.
     
     DI1 : Monitor input state.
-    - Log rising edge events.
+    - Log rising edge events as soon as they arrive.
 
     AI1 : Monitor engineering unit inst reading.
     - Log changes in max reading.
@@ -39,37 +40,43 @@ class MonitorIOChannels(Task):
         super().__init__("Monitor IO Task")
         self._cycle_period = 1
 
+        # HCC2 IO tags are not registered by this app, so add their data types to convert values on arrival
+        value_decoders.register("liveValue.diagnostics.this.io.0.digitalIn.ch1.", TagDataType.BOOL)
+        value_decoders.register("liveValue.diagnostics.this.io.0.analogIn.eu.ch1.", TagDataType.DOUBLE)
+
         # Subscribe to HCC2 Digital Input 1 (Input State)
-        Subscriptions.subscribe("liveValue.diagnostics.this.io.0.digitalIn.ch1.")
+        # The handler is called on a subscription worker thread for every new message
         self._last_dio_state = False
+        Subscriptions.on("liveValue.diagnostics.this.io.0.digitalIn.ch1.", self.on_di1_message)
+        Subscriptions.subscribe("liveValue.diagnostics.this.io.0.digitalIn.ch1.")
 
         # Subscribe to HCC2 Analog Input 1 (Inst EU Reading)
         Subscriptions.subscribe("liveValue.diagnostics.this.io.0.analogIn.eu.ch1.")
         self._ai_max = 0
+        self._ai_sequence = 0
 
-    def execute(self):
-        """Monitor IO Channel Values."""
+    def on_di1_message(self, di1_state_message):
+        """Digital Input 1 subscription handler."""
 
-        # Digital Input 1
-        # Get SimpleMessage if DI1 has new subscription data, else None
-        di1_state_message = Subscriptions.active["liveValue.diagnostics.this.io.0.digitalIn.ch1."].get()
+        di1_state = di1_state_message.value
 
-        if di1_state_message is not None:
-            di1_state = di1_state_message.value
+        # Check for rising edge
+        if (not self._last_dio_state) and di1_state:
+            hcc2_logger.info("DI1 Rising Edge Detected.")
 
-            # Check for rising edge
-            if (not self._last_dio_state) and di1_state:
-                hcc2_logger.info("DI1 Rising Edge Detected.")
+        self._last_dio_state = di1_state
 
-            self._last_dio_state = di1_state
+    def execute(self):
+        """Monitor IO Channel Values."""
 
         # Analog Input 1
-        # Get latest AI1 value
-        ai1_value_message = Subscriptions.active["liveValue.diagnostics.this.io.0.analogIn.eu.ch1."].latest()
+        # Peek at the latest AI1 value and its sequence number, buffered values are kept
+        sequence, ai1_value_message = Subscriptions.active["liveValue.diagnostics.this.io.0.analogIn.eu.ch1."].snapshot()
 
-        # Check for new AI1 EU max reading
-        if ai1_value_message is not None:
-            ai1_value = float(ai1_value_message.value)
+        # Check for new AI1 EU max reading if a value arrived since the last cycle
+        if sequence != self._ai_sequence and ai1_value_message is not None:
+            self._ai_sequence = sequence
+            ai1_value = ai1_value_message.value
 
             if ai1_value > self._ai_max:
                 self._ai_max = ai1_value
@@ -0,0 +1,49 @@
+"""send_async_read_write.py
+
+Example: Run many concurrent reads and writes from one thread with the AsyncRestAPI class.
+"""
+
+import os
+import sys
+import asyncio
+
+# Allows local imports in non-package script.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Local
+from api import AsyncRestAPI
+from config import AppConfig
+
+
+async def read_channel(rest_api: AsyncRestAPI, channel: int):
+    """Read the engineering unit value of one analog input channel."""
+
+    messages = await rest_api.message_read_simple(f"liveValue.diagnostics.this.io.0.analogIn.eu.ch{channel}.")
+    return messages[0].value if messages else None
+
+
+async def example_async_read_write():
+
+    # Resolve rest server IP address
+    AppConfig.resolve_ips()
+
+    # Pooled session is closed when leaving the context
+    async with AsyncRestAPI(max_concurrency=32) as rest_api:
+
+        # Check rest server is reachable
+        if not await rest_api.ping():
+            print(f"Rest server {AppConfig.rest_ip} is not reachable!")
+            return -1
+
+        # Read all 8 analog inputs concurrently
+        values = await asyncio.gather(*(read_channel(rest_api, ch) for ch in range(1, 9)))
+        print("Analog Inputs EU Values")
+        print(values, "\n")
+
+        # Read all 8 digital inputs as one request
+        messages = await rest_api.message_read_simple(
+            [f"liveValue.diagnostics.this.io.0.digitalIn.ch{ch}." for ch in range(1, 9)])
+        print("Digital Input States")
+        print([msg.value for msg in messages], "\n")
+
+asyncio.run(example_async_read_write())
@@ -35,9 +35,11 @@ def setup_subscription():
         return -1
 
     # Subscribe to HCC2 IO Board Rail Voltages
-    Subscriptions.subscribe("liveValue.diagnostics.this.io.0.rail.voltage.v1p2.")
-    Subscriptions.subscribe("liveValue.diagnostics.this.io.0.rail.voltage.v3p3.")
-    Subscriptions.subscribe("liveValue.diagnostics.this.io.0.rail.voltage.v5.")
+    Subscriptions.subscribe_many([
+        "liveValue.diagnostics.this.io.0.rail.voltage.v1p2.",
+        "liveValue.diagnostics.this.io.0.rail.voltage.v3p3.",
+        "liveValue.diagnostics.this.io.0.rail.voltage.v5."
+    ])
 
     # Delay 5 seconds for new data to come in.
     time.sleep(5)
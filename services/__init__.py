@@ -6,10 +6,12 @@ Modules
 - provisioning : Thread class to manage incoming provisioning data for review.
 - registration : Function to handle the combination of static and dynamic registration.
 - subscriptions : Contains classes to create, delete and manage all active message subscriptions.
+- subscription_buffer : Bounded message and columnar history buffers for subscription data.
 - heartbeat : Contains classes to ping HCC2 rest server and update application heartbeat.
 """
 
 from .provisioning import Provisioning, PostValidConfig
 from .registration import registration
 from .subscriptions import Subscriptions
+from .subscription_buffer import MessageBuffer, ColumnarBuffer, OverflowPolicy
 from .heartbeat import Heartbeat
@@ -57,6 +57,7 @@ class Heartbeat(threading.Thread):
                     os._exit(ExitCode.REGISTRATION_NO_LONGER_VALID)
 
             except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError):
+                # CircuitOpenError is a ConnectionError, breaker rejections count as failed heartbeats
                 hcc2_logger.error(f"Heartbeat attempt {self.failed_attempts+1} failed.")
                 self.failed_attempts += 1
                 if self.failed_attempts >= 10:
@@ -64,4 +65,6 @@ class Heartbeat(threading.Thread):
                     Heartbeat.last_heartbeat = False
                     AppConfig.running(set_state=False)
                     os._exit(ExitCode.REST_SERVER_NOT_FOUND)
-                time.sleep(1)
+
+                # Wait until the breaker allows a probe if it is open
+                time.sleep(max(RestAPI.circuit_breaker.retry_after(), 1))
@@ -10,13 +10,12 @@ import json
 import tarfile
 import threading
 from http import HTTPStatus
-from urllib.parse import urljoin
 
 # Third party
 import requests
 
 # Local
-from api import RestAPI
+from api import RestAPI, CircuitOpenError, topic_registry
 from config import AppConfig, ExitCode
 from utils import info_banner
 
@@ -74,13 +73,19 @@ class Provisioning(threading.Thread):
         """Initialize the provisioning thread."""
         super().__init__()
         self.rest = RestAPI(version=1)
+        self.rest.timeout = 5
         self.validation_function = validation_function
         self.pre_valid_config = {}
+        self.failed_polls = 0
+        self.config_prefix = f"liveValue.postvalidConfig.this.{AppConfig.app_func_name}.0."
 
     def _get_pre_valid_config_data(self) -> bool:
         """Get provisioning TAR.GZ from REST server.
         Store data into self.pre_valid_config dictionary."""
 
+        if AppConfig.provisioning_stream_targz:
+            return self._stream_pre_valid_config_data()
+
         targz_data = self.rest.get_targz_app(AppConfig.app_func_name)
 
         # Get parameters_this_0.json data from TAR.GZ
@@ -97,8 +102,33 @@ class Provisioning(threading.Thread):
             hcc2_logger.info('No config data found!')
             return False
 
+        finally:
+            if targz_data is not None:
+                targz_data.close()
+
         return True
 
+    def _stream_pre_valid_config_data(self) -> bool:
+        """Stream provisioning TAR.GZ from REST server.
+        Only parameters_this_0.json is extracted, the archive is never held in memory."""
+
+        with self.rest.stream_targz_app(AppConfig.app_func_name) as targz_stream:
+            if targz_stream is None:
+                hcc2_logger.info('No config data found!')
+                return False
+
+            # Read members in archive order until parameters_this_0.json
+            with tarfile.open(fileobj=targz_stream, mode="r|gz") as tar:
+                for member in tar:
+                    if member.name == 'parameters_this_0.json':
+                        f = tar.extractfile(member)
+                        if f is None:
+                            raise IOError("Failed to extract parameters_this_0.json from the tarball")
+                        self.pre_valid_config = json.load(f)
+                        return True
+
+        raise KeyError("filename 'parameters_this_0.json' not found")
+
     def _update_post_valid_config(self):
         """Get post valid config data from HCC2 message reads."""
 
@@ -107,7 +137,7 @@ class Provisioning(threading.Thread):
         for topic in self.pre_valid_config.keys():
             if topic != 'hash':
                 try:
-                    value = self.rest.message_read_simple(f"liveValue.postvalidConfig.this.{AppConfig.app_func_name}.0.{topic}.")[0].value
+                    value = self.rest.message_read_simple(topic_registry.resolve(topic, self.config_prefix).fqn)[0].value
 
                 except IndexError:
                     hcc2_logger.info(f'Configuration value {topic} could not be read from Live Data.')
@@ -137,12 +167,7 @@ class Provisioning(threading.Thread):
             is_valid = True
 
         # POST Validation Result
-        response = requests.post(
-            urljoin(self.rest.url, f"app-provision/{AppConfig.app_func_name}"),
-            json={"isValid": is_valid},
-            headers={"Content-Type": "application/json"},
-            timeout=5
-        )
+        response = self.rest.provisioning_result(AppConfig.app_func_name, is_valid)
 
         if (response.status_code == HTTPStatus.NO_CONTENT) or response.ok:
             hcc2_logger.info(f'Provisioning complete. Result {("Pass" if is_valid else "Fail")}')
@@ -156,10 +181,8 @@ class Provisioning(threading.Thread):
         while AppConfig.running():
             try:
                 # Get provisioning status
-                response = requests.get(
-                    urljoin(self.rest.url, f'app-provision/{AppConfig.app_func_name}'),
-                    timeout=5
-                )
+                response = self.rest.provisioning_status(AppConfig.app_func_name)
+                self.failed_polls = 0
 
                 # Continue if bad request
                 if response.status_code != HTTPStatus.OK:
@@ -192,9 +215,16 @@ class Provisioning(threading.Thread):
 
                 PostValidConfig.list()
 
+            except CircuitOpenError:
+                # REST server is known to be down, wait until the breaker allows a probe
+                hcc2_logger.error("Provisioning fetch failed, REST server circuit breaker is open.")
+                time.sleep(max(RestAPI.circuit_breaker.retry_after(), AppConfig.provisioning_poll))
+                self.failed_polls += 1
+
             except (requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError):
                 hcc2_logger.error("Provisioning fetch failed.")
-                time.sleep(10)
+                time.sleep(RestAPI.retry_policy.backoff(self.failed_polls, max_delay=10))
+                self.failed_polls += 1
 
             except Exception as exc:
                 hcc2_logger.error(f"A provisoning error occurred: {exc}")
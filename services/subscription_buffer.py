@@ -0,0 +1,220 @@
+"""subscription_buffer.py
+
+Bounded message and columnar history buffers for subscription data.
+"""
+
+import math
+import array
+import threading
+from collections import deque
+
+# Third party (Optional)
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class OverflowPolicy():
+    """Subscription buffer overflow policies."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+
+
+class MessageBuffer:
+    """Thread safe bounded FIFO buffer of subscription messages.
+
+    When full, `policy` decides what happens to a new message,
+        DROP_OLDEST : The oldest buffered message is discarded.
+        DROP_NEWEST : The new message is discarded.
+        BLOCK : The producer waits up to `block_timeout` seconds for space,
+                then discards the new message. With the werkzeug engine the
+                producer is the listener thread, so every topic on that
+                listener waits too.
+
+    Attributes:
+    -----------
+    capacity: int
+        Maximum number of buffered messages.
+    received: int
+        Total messages offered to the buffer.
+    dropped: int
+        Total messages discarded because the buffer was full.
+    high_water: int
+        Largest number of messages buffered at once.
+    """
+
+    def __init__(self, capacity=1000, policy=OverflowPolicy.DROP_OLDEST, block_timeout=1.0):
+        if capacity < 1:
+            raise ValueError("Buffer capacity must be at least 1.")
+        if policy not in (OverflowPolicy.DROP_OLDEST, OverflowPolicy.DROP_NEWEST, OverflowPolicy.BLOCK):
+            raise ValueError(f"Unknown overflow policy '{policy}'.")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._not_empty = threading.Condition(self._lock)
+
+        # Metrics
+        self.received = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def put(self, message) -> bool:
+        """Add a message. Returns False if the message was dropped."""
+        with self._lock:
+            self.received += 1
+
+            if len(self._items) >= self.capacity:
+                if self.policy == OverflowPolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+
+                elif self.policy == OverflowPolicy.DROP_NEWEST or not self._not_full.wait_for(
+                        lambda: len(self._items) < self.capacity, self.block_timeout):
+                    self.dropped += 1
+                    return False
+
+            self._items.append(message)
+            self.high_water = max(self.high_water, len(self._items))
+            self._not_empty.notify()
+            return True
+
+    def get(self, timeout=0.0):
+        """Remove and return the oldest message.
+
+        Waits up to `timeout` seconds for a message, forever if None.
+        Returns None if no message arrived in time.
+        """
+        with self._lock:
+            if not self._items and (timeout == 0 or not self._not_empty.wait_for(lambda: self._items, timeout)):
+                return None
+            message = self._items.popleft()
+            self._not_full.notify()
+            return message
+
+    def latest(self):
+        """Return the newest message and discard all buffered messages, None if empty."""
+        with self._lock:
+            if not self._items:
+                return None
+            message = self._items[-1]
+            self._items.clear()
+            self._not_full.notify_all()
+            return message
+
+    def __len__(self):
+        return len(self._items)
+
+    def empty(self) -> bool:
+        """True if no messages are buffered."""
+        return not self._items
+
+    def stats(self) -> dict:
+        """Return buffer occupancy and counters."""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "policy": self.policy,
+                "size": len(self._items),
+                "received": self.received,
+                "dropped": self.dropped,
+                "high_water": self.high_water
+            }
+
+
+class ColumnarBuffer:
+    """Thread safe preallocated ring of tag samples stored as columns.
+
+    Values (float, NaN if not numeric), timestamps (ms) and quality are kept
+    in NumPy arrays if NumPy is installed, else in `array` module arrays.
+    Every sample is written twice, at i and i + capacity, so the newest n
+    samples are always one contiguous slice and windows are returned as zero
+    copy views (NumPy array views or memoryviews).
+
+    Views share memory with the ring and are overwritten once `capacity`
+    further samples arrive. Copy a window to keep it longer.
+    """
+
+    backend = "numpy" if numpy is not None else "array"
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("Buffer capacity must be at least 1.")
+
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._head = 0
+        self._count = 0
+
+        if numpy is not None:
+            self._values = numpy.full(2 * capacity, numpy.nan, dtype=numpy.float64)
+            self._timestamps = numpy.zeros(2 * capacity, dtype=numpy.int64)
+            self._quality = numpy.zeros(2 * capacity, dtype=numpy.int32)
+        else:
+            self._values = array.array("d", [math.nan]) * (2 * capacity)
+            self._timestamps = array.array("q", [0]) * (2 * capacity)
+            self._quality = array.array("i", [0]) * (2 * capacity)
+
+    def append(self, value, timestamp: int, quality: int):
+        """Add a sample, overwriting the oldest once full.
+
+        Non numeric values are stored as NaN. Raises ValueError if the
+        timestamp or quality is not an integer, nothing is stored then.
+        """
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = math.nan
+        timestamp = int(timestamp)
+        quality = int(quality)
+
+        with self._lock:
+            i = self._head
+            j = i + self.capacity
+            self._values[i] = self._values[j] = value
+            self._timestamps[i] = self._timestamps[j] = timestamp
+            self._quality[i] = self._quality[j] = quality
+            self._head = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def append_message(self, message):
+        """Add the value, timestamp and quality of a SimpleMessage."""
+        self.append(message.value, message.timeStamp, message.quality)
+
+    def window(self, n=None) -> tuple:
+        """Return (values, timestamps, quality) views of the newest `n` samples, oldest first.
+
+        Returns all buffered samples if `n` is None.
+        """
+        with self._lock:
+            n = self._count if n is None else max(0, min(n, self._count))
+            end = self._head + self.capacity
+            start = end - n
+
+        if numpy is not None:
+            return self._values[start:end], self._timestamps[start:end], self._quality[start:end]
+
+        return (
+            memoryview(self._values)[start:end],
+            memoryview(self._timestamps)[start:end],
+            memoryview(self._quality)[start:end]
+        )
+
+    def values(self, n=None):
+        """View of the newest `n` values, oldest first."""
+        return self.window(n)[0]
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        """Discard all samples."""
+        with self._lock:
+            self._head = 0
+            self._count = 0
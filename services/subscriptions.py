@@ -3,23 +3,204 @@
 Contains classes to create, delete and manage all active message subscriptions.
 """
 
-import queue
+import re
+import time
+import asyncio
+import fnmatch
+import inspect
 import logging
 import threading
-import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
+from typing import Callable
 
 # Third party
+from aiohttp import web
 from flask import Flask, request, jsonify
 from werkzeug.exceptions import BadRequest, InternalServerError
 from werkzeug.serving import make_server
+from requests.exceptions import RequestException
 
 # Local
 from api.hcc2_rest_schema import (
     SimpleMessage, ComplexMessage, DataPoint
 )
 from api import RestAPI
+from api.hcc2_rest_columnar import ColumnarComplexMessage
+from api.hcc2_rest_decode import value_decoders
+from api.hcc2_rest_topics import topic_registry
 from config import AppConfig
+from services.subscription_buffer import MessageBuffer, ColumnarBuffer, OverflowPolicy
+
+# Logging
+hcc2_logger = logging.getLogger(AppConfig.app_func_name)
+hcc2_logger.propagate = False
+
+
+class WebhookEngine():
+    """Webhook listener server implementations."""
+
+    WERKZEUG = "werkzeug"
+    ASYNCIO = "asyncio"
+
+
+def parse_message(data: dict) -> SimpleMessage | ComplexMessage:
+    """Build a SimpleMessage or ComplexMessage from a subscription callback payload."""
+
+    # Simple Message
+    if data.get("value", None) is not None:
+        data["value"] = value_decoders.decode(data["topic"], data["value"])
+        return SimpleMessage(**data)
+
+    # Complex Message
+    if (dp := data.get("datapoints", None)):
+        for subtag in dp:
+            subtag["values"] = value_decoders.decode(data["topic"], subtag.get("values"))
+
+        return ComplexMessage(
+            data['topic'],
+            [DataPoint(**subtag) for subtag in dp],
+            data['msgSource']
+        )
+
+    return None
+
+
+# Whitespace, colon and whitespace between an object key and its value
+_KEY_SEPARATOR = re.compile(rb'\s*:\s*')
+
+
+def _key_value(raw: bytes, key: bytes) -> int:
+    """Index of the value of a top level object key found without decoding, -1 if not found.
+
+    The key must appear once, be preceded by the opening brace or a comma and
+    be followed by whitespace and a colon. It must also be outside nested
+    objects and arrays, so either no other brace or bracket opens before it
+    or none closes after it. Anything else is treated as not found, the
+    payload is ambiguous.
+    """
+
+    index = raw.find(key)
+    if index < 0 or raw.find(key, index + len(key)) >= 0:
+        return -1
+
+    prefix = raw[:index]
+    if prefix.rstrip()[-1:] not in (b'{', b','):
+        return -1
+
+    if (prefix.count(b'{') != 1 or b'[' in prefix) and (raw.count(b'}', index) != 1 or raw.find(b']', index) >= 0):
+        return -1
+
+    separator = _KEY_SEPARATOR.match(raw, index + len(key))
+    return separator.end() if separator is not None else -1
+
+
+def _scan_topic(raw: bytes) -> str:
+    """Find the top level topic string of a callback payload without decoding it, None if not found or ambiguous."""
+
+    start = _key_value(raw, b'"topic"')
+    if start < 0 or raw[start:start + 1] != b'"':
+        return None
+
+    end = raw.find(b'"', start + 1)
+    if end < 0:
+        return None
+
+    topic = raw[start + 1:end]
+    if b'\\' in topic:
+        return None
+
+    return topic.decode("utf-8")
+
+
+def _check_payload(raw: bytes) -> bool:
+    """Cheap structural check of a callback payload queued without decoding.
+
+    The payload must be a JSON object with a non null top level value, or a
+    non empty datapoints list of objects and a msgSource.
+    """
+
+    body = raw.strip()
+    if body[:1] != b'{' or body[-1:] != b'}':
+        return False
+
+    value = _key_value(body, b'"value"')
+    if value >= 0 and not body.startswith(b'null', value):
+        return True
+
+    datapoints = _key_value(body, b'"datapoints"')
+    if datapoints < 0 or body[datapoints:datapoints + 1] != b'[':
+        return False
+
+    return body[datapoints + 1:datapoints + 64].lstrip()[:1] == b'{' and _key_value(body, b'"msgSource"') >= 0
+
+
+class LazyMessage:
+    """A subscription message kept as raw payload bytes.
+
+    Only the topic is extracted on ingest. The payload is decoded and the
+    SimpleMessage or ComplexMessage built on first access to any other
+    attribute, then cached. Attribute access is forwarded, so a LazyMessage
+    reads like the message it wraps.
+
+    A payload that fails to decode is logged once and the error cached, every
+    later access raises ValueError without decoding again.
+    """
+
+    __slots__ = ("topic", "raw", "_message", "_error")
+
+    def __init__(self, topic: str, raw: bytes):
+        self.topic = topic
+        self.raw = raw
+        self._message = None
+        self._error = None
+
+    @property
+    def message(self) -> SimpleMessage | ComplexMessage:
+        """Decoded message. Raises ValueError if the payload is invalid."""
+        if self._message is None:
+            if self._error is None:
+                try:
+                    self._message = parse_message(RestAPI.codec.loads(self.raw))
+                    if self._message is None:
+                        raise ValueError("no value or datapoints")
+                    return self._message
+                except (ValueError, TypeError, KeyError, AttributeError) as e:
+                    self._error = f"Invalid subscription payload for {self.topic}: {e}"
+                    hcc2_logger.warning(self._error)
+            raise ValueError(self._error)
+        return self._message
+
+    @property
+    def valid(self) -> bool:
+        """False once decoding the payload failed."""
+        return self._error is None
+
+    def columnar(self, data_types=None) -> ColumnarComplexMessage:
+        """Decode the payload straight to a ColumnarComplexMessage, skipping DataPoint objects."""
+        return ColumnarComplexMessage.from_wire(RestAPI.codec.loads(self.raw), data_types or value_decoders.data_type(self.topic))
+
+    def __getattr__(self, name):
+        return getattr(self.message, name)
+
+    def __repr__(self):
+        return f"LazyMessage(topic={self.topic!r}, size={len(self.raw)})"
+
+
+def resolve(message: SimpleMessage | ComplexMessage | LazyMessage) -> SimpleMessage | ComplexMessage:
+    """Return the decoded message of a LazyMessage, any other message as is."""
+    return message.message if isinstance(message, LazyMessage) else message
+
+
+def _listed_topics(response) -> list[str]:
+    """Extract tag topics from a message/list response."""
+
+    if isinstance(response, dict):
+        response = response.get("topics", [])
+
+    return [t if isinstance(t, str) else t.get("topic", "") for t in response or []]
 
 
 class PortManager:
@@ -60,57 +241,408 @@ class PortManager:
         return sorted(self.available_ports)
 
 
-class WebhookListener:
-    """A single HCC2 message subscription thread.
-    
-    Starts a flask application thread which routes POST data from a single subscription.
-    Data recieved is placed into a thread safe FIFO queue.
+class CallbackDispatcher:
+    """Bounded worker pool running subscription message handlers.
+
+    Plain functions run on a thread pool of `workers` threads. Coroutine
+    functions run on a single shared event loop thread, awaited by the worker
+    handling the message so per-topic ordering is kept.
     """
 
-    def __init__(self, callback_api, port):
-        self.callback_api = callback_api
-        self.app = Flask(__name__)
-        self.queue = queue.Queue()
+    def __init__(self, workers=4):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = None
+        self._loop = None
+        self._loop_thread = None
+
+    def submit(self, fn: Callable):
+        """Run `fn` on the worker pool."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="subscription")
+            self._executor.submit(fn)
+
+    def call(self, handler: Callable, message):
+        """Invoke a handler with a message, waiting for coroutine handlers to finish."""
+        if not inspect.iscoroutinefunction(handler):
+            handler(message)
+            return
+
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+                self._loop_thread.start()
+
+        asyncio.run_coroutine_threadsafe(handler(message), self._loop).result()
+
+    def shutdown(self):
+        """Wait for running handlers and stop the worker pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            loop, self._loop = self._loop, None
+
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join(timeout=1)
+            loop.close()
+
+
+class Subscription:
+    """A single HCC2 message subscription.
+
+    Data routed to this subscription by a WebhookListener is placed into a
+    thread safe bounded FIFO buffer. Buffer capacity and overflow policy are
+    set in config.json.
+
+    The newest message is also kept in a last-value slot together with a
+    sequence number counting every received message. Reading it is constant
+    time and does not consume buffered messages.
+
+    Handlers added to a subscription are called with every received message,
+    in order, on the dispatcher worker pool.
+
+    A subscription is stale once no message arrived for `stale_factor` times
+    its `expected_interval` seconds. An expected interval of 0 disables the
+    check. Stale subscriptions are only registered again by the supervisor if
+    their `watchdog` is enabled.
+
+    If created with a history capacity, simple message values, timestamps and
+    quality are also recorded in a ColumnarBuffer for windowed analytics.
+    Samples are recorded on the dispatcher worker pool, so lazy messages are
+    not decoded on the webhook thread. Messages that cannot be recorded are
+    counted in `history_dropped`.
+    """
+
+    # Messages handled per worker turn before yielding to other topics
+    dispatch_batch = 100
+
+    def __init__(self, topic: str, route_id: int, listener: "BaseWebhookListener", dispatcher: CallbackDispatcher = None,
+                 history=None):
+        info = topic_registry.intern(topic)
+        self.topic = info.fqn
+        self.topic_id = info.id
+        self.route_id = route_id
+        self.listener = listener
+        self.dispatcher = dispatcher
+        self.handlers = []
+        self.handler_dropped = 0
+        self.history_dropped = 0
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._dispatching = False
+        self._waiters = []
+        self.buffer = MessageBuffer(
+            AppConfig.subscription_buffer_capacity,
+            AppConfig.subscription_overflow_policy,
+            AppConfig.subscription_block_timeout
+        )
+
+        # (sequence, message) replaced as a whole so readers never see a torn pair
+        self._last = (0, None)
+
+        history = AppConfig.subscription_history_capacity if history is None else history
+        self.columns = ColumnarBuffer(history) if history > 0 else None
+
+        # Freshness
+        self.expected_interval = AppConfig.subscription_expected_interval
+        self.watchdog = AppConfig.subscription_watchdog
+        self.subscribed_at = time.monotonic()
+        self.last_received = None
+        self.resubscribes = 0
+
+    def put(self, message: SimpleMessage | ComplexMessage) -> bool:
+        """Add a received message. Returns False if the buffer dropped it."""
+        self.last_received = time.monotonic()
+        self._last = (self._last[0] + 1, message)
+        accepted = self.buffer.put(message)
+
+        if self.columns is not None and self.dispatcher is None:
+            self._record(message)
+
+        if self.handlers or (self.columns is not None and self.dispatcher is not None):
+            self._dispatch(message)
+        if self._waiters:
+            self._wake_waiters()
+
+        return accepted
+
+    def _dispatch(self, message):
+        with self._lock:
+            if len(self._pending) >= self.buffer.capacity:
+                self._pending.popleft()
+                self.handler_dropped += 1
+            self._pending.append(message)
+
+            if self._dispatching:
+                return
+            self._dispatching = True
+
+        self.dispatcher.submit(self._drain)
+
+    def _drain(self):
+        """Call handlers with pending messages in arrival order."""
+        for _ in range(self.dispatch_batch):
+            with self._lock:
+                if not self._pending:
+                    self._dispatching = False
+                    return
+                message = self._pending.popleft()
+
+            if self.columns is not None:
+                self._record(message)
+
+            for handler in list(self.handlers):
+                try:
+                    self.dispatcher.call(handler, message)
+                except Exception as exc:
+                    hcc2_logger.error(f"Subscription handler for {self.topic} failed: {exc}")
+
+        # Yield the worker to other topics and continue later
+        self.dispatcher.submit(self._drain)
+
+    def _record(self, message):
+        """Add a simple message to the history columns, counting messages that cannot be recorded."""
+        try:
+            if isinstance(decoded := resolve(message), SimpleMessage):
+                self.columns.append_message(decoded)
+        except (TypeError, ValueError, OverflowError):
+            self.history_dropped += 1
+
+    def _wake_waiters(self):
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    @property
+    def sequence(self) -> int:
+        """Number of messages received, 0 if none."""
+        return self._last[0]
+
+    def last_value(self) -> SimpleMessage | ComplexMessage:
+        """Newest received message without consuming the buffer, None if none received."""
+        return self._last[1]
+
+    def snapshot(self) -> tuple[int, SimpleMessage | ComplexMessage]:
+        """Newest received message and its sequence number."""
+        return self._last
+
+    def changed_since(self, sequence: int) -> bool:
+        """True if a message was received after `sequence`."""
+        return self._last[0] != sequence
+
+    def history(self, n=None) -> tuple:
+        """Zero copy (values, timestamps, quality) views of the newest `n` samples, oldest first.
+
+        Requires a history capacity, see ColumnarBuffer.
+        """
+        if self.columns is None:
+            raise RuntimeError(f"Subscription {self.topic} has no history buffer.")
+        return self.columns.window(n)
+
+    def age(self) -> float:
+        """Seconds since the last received message, None if nothing was received."""
+        if self.last_received is None:
+            return None
+        return time.monotonic() - self.last_received
+
+    def is_stale(self) -> bool:
+        """True if no message arrived within the expected interval times the stale factor.
+
+        Timed from the last message, or from (re)subscribing if that is later.
+        """
+        if self.expected_interval <= 0:
+            return False
+        since = max(self.last_received or 0.0, self.subscribed_at)
+        return time.monotonic() - since > self.expected_interval * AppConfig.subscription_stale_factor
+
+    def get(self, timeout=0.0) -> SimpleMessage | ComplexMessage:
+        """Retrieve the next value from the buffer.
+
+        Waits up to `timeout` seconds for a value, forever if None. Returns
+        None if no value is available.
+        """
+        return self.buffer.get(timeout)
+
+    async def get_async(self, timeout=None) -> SimpleMessage | ComplexMessage:
+        """Await the next value from the buffer.
+
+        Waits up to `timeout` seconds, forever if None. Returns None if no
+        value arrived in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            if (message := self.buffer.get()) is not None:
+                return message
+
+            future = loop.create_future()
+            with self._lock:
+                self._waiters.append((loop, future))
+
+            # A message may have arrived before the waiter was added
+            if (message := self.buffer.get()) is not None:
+                return message
+
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    if (loop, future) in self._waiters:
+                        self._waiters.remove((loop, future))
+                return self.buffer.get()
+
+    def latest(self) -> SimpleMessage | ComplexMessage:
+        """Retrieve the latest value from the buffer, discarding older values."""
+        return self.buffer.latest()
+
+    def stats(self) -> dict:
+        """Return buffer occupancy and drop counters."""
+        return {
+            **self.buffer.stats(),
+            "handler_dropped": self.handler_dropped,
+            "history_dropped": self.history_dropped,
+            "age": self.age(),
+            "stale": self.is_stale(),
+            "resubscribes": self.resubscribes
+        }
+
+    @property
+    def port(self):
+        """TCP port of the webhook listener serving this subscription."""
+        return self.listener.port
+
+    @property
+    def uri(self):
+        """Full message subscription callback URI."""
+        return self.listener.callback_uri(self.route_id)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class BaseWebhookListener(ABC):
+    """A webhook server shared by many HCC2 message subscriptions.
+
+    Listens on one port. Each batch of subscriptions registered together is
+    given its own callback path (/api/subdata/<route id>). POST data is
+    routed to the subscription of its topic within that batch. Routes are
+    keyed by topic ID.
+    """
+
+    callback_api = '/api/subdata'
+
+    def __init__(self, port):
         self.port = port
-        self.server = None
-        self.server_thread = None
+        self.routes = {}
         self.running = False
-        self.server_shutdown_event = threading.Event()
 
-        # Ignore flask app logs
-        log = logging.getLogger('werkzeug')
-        log.setLevel(logging.CRITICAL)
+    def add_route(self, subscription: Subscription):
+        """Route callback data for a subscription to it."""
+        self.routes.setdefault(subscription.route_id, {})[subscription.topic_id] = subscription
 
-        # Route callback URL
-        @self.app.route(self.callback_api, methods=['POST'])
-        def webhook():
+    def remove_route(self, subscription: Subscription):
+        """Stop routing callback data for a subscription."""
+        group = self.routes.get(subscription.route_id, {})
+        group.pop(subscription.topic_id, None)
+        if not group:
+            self.routes.pop(subscription.route_id, None)
+
+    def ingest(self, route_id: int, raw: bytes) -> tuple[int, dict]:
+        """Route a callback payload to its subscription. Returns the response status code and body.
+
+        With lazy parsing enabled, payloads with a plain topic that pass a
+        structural check are queued as LazyMessage without decoding. Payloads
+        the check cannot vouch for are decoded and validated as usual.
+        """
+        if route_id not in self.routes:
+            return 404, {"error": "unknown subscription"}
+
+        topic = _scan_topic(raw) if AppConfig.subscription_lazy_parsing else None
+        if topic is not None and _check_payload(raw):
+            message = LazyMessage(topic, raw)
+        else:
             try:
-                data = request.get_json()
+                data = RestAPI.codec.loads(raw)
+                message = parse_message(data)
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                return 400, {"error": str(e)}
+
+            if not data:
+                return 400, {"error": "invalid payload"}
+
+        if message is not None:
+            subscription = self.route(route_id, message)
+            if subscription is None:
+                return 404, {"error": "unknown subscription"}
+            subscription.put(message)
 
-                # Simple Message
-                if data.get("value", None) is not None:
-                    self.queue.put(SimpleMessage(**data))
+        return 200, {"status": "OK"}
 
-                # Complex Message
-                elif (dp := data.get("datapoints", None)):
-                    subtags = []
+    def route(self, route_id: int, message: SimpleMessage | ComplexMessage) -> Subscription:
+        """Return the subscription receiving a message posted to a route, None if unknown.
 
-                    # Extract datapoints
-                    for subtag in dp:
-                        subtags.append(DataPoint(**subtag))
+        Topics not matching exactly are matched again in FQN form, ie without
+        a trailing '.'.
+        """
+        group = self.routes.get(route_id)
+        if not group:
+            return None
+        if len(group) == 1:
+            return next(iter(group.values()))
+        if message is None:
+            return None
 
-                    self.queue.put(
-                        ComplexMessage(
-                            data['topic'],
-                            subtags,
-                            data['msgSource']
-                        )
-                    )
+        subscription = group.get(topic_registry.id(message.topic))
+        if subscription is None:
+            subscription = group.get(topic_registry.id(topic_registry.normalize(message.topic)))
+            if subscription is None:
+                hcc2_logger.warning(f"No subscription for topic {message.topic!r} on route {route_id}, message dropped.")
+        return subscription
 
-                if data:
-                    return jsonify({"status": "OK"}), 200
+    def callback_uri(self, route_id: int) -> str:
+        """Full callback URI of a subscription route."""
+        return f"http://{AppConfig.app_ip}:{self.port}{self.callback_api}/{route_id}"
+
+    @abstractmethod
+    def start_server(self):
+        """Start webhook server. Must override."""
+        pass
+
+    @abstractmethod
+    def stop_server(self):
+        """Stop webhook server. Must override."""
+        pass
 
-                return jsonify({"error": "invalid payload"}), 400
+
+class WebhookListener(BaseWebhookListener):
+    """Webhook listener served by a single flask application thread."""
+
+    def __init__(self, port):
+        super().__init__(port)
+        self.app = Flask(__name__)
+        self.server = None
+        self.server_thread = None
+
+        # Ignore flask app logs
+        log = logging.getLogger('werkzeug')
+        log.setLevel(logging.CRITICAL)
+
+        # Route callback URLs
+        @self.app.route(f'{self.callback_api}/<int:route_id>', methods=['POST'])
+        def webhook(route_id):
+            try:
+                status, body = self.ingest(route_id, request.get_data())
+                return jsonify(body), status
 
             except BadRequest as e:
                 return jsonify({"error": str(e)}), 400
@@ -122,12 +654,10 @@ class WebhookListener:
         if self.running:
             raise RuntimeError("Server already running.")
 
-        def run():
-            self.server = make_server(AppConfig.app_ip, self.port, self.app)
-            self.running = True
-            self.server.serve_forever()
+        self.server = make_server(AppConfig.app_ip, self.port, self.app)
+        self.running = True
 
-        self.server_thread = threading.Thread(target=run, daemon=True)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
         self.server_thread.start()
 
     def stop_server(self):
@@ -138,70 +668,468 @@ class WebhookListener:
         self.server_thread.join(timeout=1)
         self.running = False
 
-    def get(self) -> SimpleMessage | ComplexMessage:
-        """Retrieve the next value from the queue if available."""
-        if not self.queue.empty():
-            return self.queue.get()
-        return None
 
-    def latest(self) -> SimpleMessage | ComplexMessage:
-        """Retrieve the latest value from the queue, discarding older values."""
-        latest = None
-        while not self.queue.empty():
-            latest = self.queue.get()
-        return latest
+class AsyncWebhookListener(BaseWebhookListener):
+    """Webhook listener served by an asyncio event loop thread.
 
-    @property
-    def uri(self):
-        """Full message subscription callback URI."""
-        return f"http://{AppConfig.app_ip}:{self.port}{self.callback_api}"
+    Uses the aiohttp server and its C HTTP parser with keep-alive connections,
+    so many HCC2 callback POSTs are accepted concurrently instead of one at a
+    time. Subscriptions are fed through the same thread safe queues. With the
+    block overflow policy callbacks are ingested on executor threads, so a
+    full buffer never stalls the event loop.
+    """
+
+    _ok = b'{"status":"OK"}'
+
+    def __init__(self, port):
+        super().__init__(port)
+        self.loop = None
+        self.runner = None
+        self.server_thread = None
+
+        self.app = web.Application()
+        self.app.router.add_post(f'{self.callback_api}/{{route_id:\\d+}}', self._webhook)
+
+    async def _webhook(self, req: web.Request) -> web.Response:
+        route_id = int(req.match_info["route_id"])
+        raw = await req.read()
+
+        if AppConfig.subscription_overflow_policy == OverflowPolicy.BLOCK:
+            status, body = await self.loop.run_in_executor(None, self.ingest, route_id, raw)
+        else:
+            status, body = self.ingest(route_id, raw)
+
+        if status == 200:
+            return web.Response(body=self._ok, content_type="application/json")
+
+        return web.json_response(body, status=status)
+
+    async def _start(self):
+        self.runner = web.AppRunner(self.app, access_log=None, handle_signals=False)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, AppConfig.app_ip, self.port).start()
+
+    def start_server(self):
+        """Start webhook server."""
+        if self.running:
+            raise RuntimeError("Server already running.")
+
+        self.loop = asyncio.new_event_loop()
+        self.server_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.server_thread.start()
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(timeout=5)
+        except BaseException:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            raise
+
+        self.running = True
+
+    def stop_server(self):
+        """Stop webhook server."""
+        if not self.running:
+            raise RuntimeError("Server not running.")
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.server_thread.join(timeout=1)
+        self.loop.close()
+        self.running = False
 
 
 class Subscriptions:
-    """Class to manage active subscriptions."""
+    """Class to manage active subscriptions.
+
+    All subscriptions share a small fixed pool of webhook listeners, one port
+    and one thread each. Topics are spread over the pool.
+    """
 
     subscription_api = RestAPI()
     active = {}
+    listeners = []
+    handlers = []
+    # Subscribed patterns and the topics each one subscribed
+    patterns = {}
+    dispatcher = CallbackDispatcher(AppConfig.subscription_callback_workers)
+    supervisor = None
+
+    _lock = threading.RLock()
+    _next_route_id = 0
+    _expansions = {}
 
     # Exposed TCP ports for docker container
     port_manager = PortManager([14000, 14100])
 
     @classmethod
-    def subscribe(cls, topic: str) -> bool:
-        """Subscribe to an HCC2 message and create a webhook listener application on an unallocated port."""
+    def _listener(cls, route_id: int) -> BaseWebhookListener:
+        """Return the listener serving a route, starting the listener pool on first use."""
 
-        port = cls.port_manager.allocate_port()
-        callback_uri = cls.subscription_api.subscribe(
-            AppConfig.app_func_name,
-            f"http://{AppConfig.app_ip}:{port}/api/subdata",
-            topic)
+        if not cls.listeners:
+            if AppConfig.subscription_engine == WebhookEngine.ASYNCIO:
+                listener_type = AsyncWebhookListener
+            else:
+                listener_type = WebhookListener
 
-        if callback_uri:
+            for _ in range(AppConfig.subscription_listeners):
+                listener = listener_type(port=cls.port_manager.allocate_port())
+                listener.start_server()
+                cls.listeners.append(listener)
 
-            # Create and start the webhook flask application
-            webhook = WebhookListener('/api/subdata', port=port)
-            webhook.start_server()
+        return cls.listeners[route_id % len(cls.listeners)]
 
-            cls.active.update({topic: webhook})
+    @classmethod
+    def subscribe(cls, topic: str, expected_interval=None, history=None, watchdog=None) -> bool:
+        """Subscribe to an HCC2 message and route its callback data to a shared webhook listener."""
 
-            return True
-        return False
+        return cls.subscribe_many([topic], expected_interval=expected_interval, history=history, watchdog=watchdog)
+
+    @classmethod
+    def subscribe_many(cls, topics: list[str], batch_size=None, expected_interval=None, history=None,
+                       watchdog=None) -> bool:
+        """Subscribe to many HCC2 messages.
+
+        Topics are registered in batches of `batch_size`, one REST request per
+        batch. Each batch shares one callback route. Returns True if every
+        topic is subscribed.
+
+        `expected_interval` overrides the configured seconds between messages
+        used for stale detection, 0 disables it for these topics. `watchdog`
+        overrides the configured watchdog, True registers these topics again
+        once stale. `history` overrides the configured columnar history
+        capacity, 0 disables it.
+        """
+
+        batch_size = batch_size or AppConfig.subscription_batch_size
+        topics = list(dict.fromkeys(topics))
+
+        with cls._lock:
+            # Topics subscribed explicitly are no longer removed with the pattern that added them
+            for added in cls.patterns.values():
+                added.difference_update(topics)
+            topics = [t for t in topics if t not in cls.active]
+
+        success = True
+
+        for start in range(0, len(topics), batch_size):
+            with cls._lock:
+                route_id = cls._next_route_id
+                cls._next_route_id += 1
+                listener = cls._listener(route_id)
+
+                batch = []
+                for topic in topics[start:start + batch_size]:
+                    subscription = Subscription(topic, route_id, listener, cls.dispatcher, history)
+                    if expected_interval is not None:
+                        subscription.expected_interval = expected_interval
+                    if watchdog is not None:
+                        subscription.watchdog = watchdog
+                    subscription.handlers = [h for pattern, h in cls.handlers if fnmatch.fnmatchcase(topic, pattern)]
+                    listener.add_route(subscription)
+                    batch.append(subscription)
+
+            try:
+                callback_uri = cls.subscription_api.subscribe(
+                    AppConfig.app_func_name,
+                    listener.callback_uri(route_id),
+                    [subscription.topic for subscription in batch])
+            except Exception:
+                with cls._lock:
+                    for subscription in batch:
+                        listener.remove_route(subscription)
+                raise
+
+            with cls._lock:
+                for subscription in batch:
+                    if callback_uri:
+                        cls.active.update({subscription.topic: subscription})
+                    else:
+                        listener.remove_route(subscription)
+
+            success = success and bool(callback_uri)
+
+        if watchdog or (watchdog is None and AppConfig.subscription_watchdog):
+            cls._start_supervisor()
+
+        return success
+
+    @classmethod
+    def resubscribe(cls, topics: list[str]) -> bool:
+        """Register active subscriptions with the HCC2 Rest Server again, keeping their buffers and handlers.
+
+        Topics sharing a callback route are re-registered in one request.
+        """
+
+        with cls._lock:
+            routes = {}
+            for topic in topics:
+                if (subscription := cls.active.get(topic)) is not None:
+                    routes.setdefault((subscription.listener, subscription.route_id), []).append(subscription)
+
+        success = True
+        for (listener, route_id), batch in routes.items():
+            try:
+                callback_uri = cls.subscription_api.subscribe(
+                    AppConfig.app_func_name,
+                    listener.callback_uri(route_id),
+                    [subscription.topic for subscription in batch])
+            except RequestException as exc:
+                hcc2_logger.debug(f"Resubscribe failed: {exc}")
+                callback_uri = ""
+
+            # Restart the stale timer either way so retries are spaced by the stale window
+            for subscription in batch:
+                subscription.subscribed_at = time.monotonic()
+                if callback_uri:
+                    subscription.resubscribes += 1
+
+            success = success and bool(callback_uri)
+
+        return success
+
+    @classmethod
+    def stale(cls, watched=False) -> list[str]:
+        """Topics of all stale subscriptions, only those with the watchdog enabled if `watched`."""
+
+        with cls._lock:
+            active = list(cls.active.items())
+
+        return [topic for topic, subscription in active
+                if (subscription.watchdog or not watched) and subscription.is_stale()]
+
+    @classmethod
+    def freshness(cls) -> dict:
+        """Seconds since the last message and stale state of every active subscription by topic."""
+
+        with cls._lock:
+            active = list(cls.active.items())
+
+        return {
+            topic: {"age": subscription.age(), "stale": subscription.is_stale(), "resubscribes": subscription.resubscribes}
+            for topic, subscription in active
+        }
 
     @classmethod
     def unsubscribe(cls, topic: str) -> bool:
-        """Unsubscribe from any number of HCC2 messages."""
+        """Unsubscribe from an HCC2 message."""
 
         response = cls.subscription_api.unsubscribe(
             AppConfig.app_func_name,
             topic)
 
         if response.status_code == HTTPStatus.OK:
-            webhook = cls.active[topic]
+            cls._remove(topic)
+            return True
+        return False
 
-            cls.port_manager.release_port(webhook.port)
-            webhook.stop_server()
+    @classmethod
+    def unsubscribe_many(cls, topics: list[str]) -> bool:
+        """Unsubscribe from many HCC2 messages with concurrent requests. Returns True if all succeeded."""
 
-            del cls.active[topic]
+        results = cls.subscription_api.unsubscribe_bulk(AppConfig.app_func_name, list(topics))
 
-            return True
-        return False
+        for topic, ok in results.items():
+            if ok:
+                cls._remove(topic)
+
+        return all(results.values())
+
+    @classmethod
+    def expand(cls, pattern: str, refresh=False) -> list[str]:
+        """Expand a wildcard pattern to the matching tag topics on the HCC2.
+
+        Expansions are cached for `pattern_cache_ttl` seconds unless
+        `refresh` is set.
+        """
+
+        now = time.monotonic()
+        cached = cls._expansions.get(pattern)
+        if cached is not None and not refresh and now < cached[0]:
+            return cached[1]
+
+        # List everything under the fixed prefix of the pattern, then match locally
+        prefix = re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+        listed = cls.subscription_api.message_list(prefix)
+        if listed is None:
+            return cached[1] if cached is not None else []
+
+        topics = [t for t in _listed_topics(listed) if fnmatch.fnmatchcase(t, pattern)]
+        cls._expansions[pattern] = (now + AppConfig.subscription_pattern_cache_ttl, topics)
+        return topics
+
+    @classmethod
+    def subscribe_pattern(cls, pattern: str, expected_interval=None, history=None, watchdog=None) -> bool:
+        """Subscribe to every tag topic matching a shell style wildcard pattern.
+
+        The pattern is re-expanded every `pattern_refresh_interval` seconds,
+        or on demand with refresh_patterns(), to subscribe to new tags.
+        Topics already subscribed are left to their existing subscription.
+        """
+
+        with cls._lock:
+            cls.patterns.setdefault(pattern, set())
+            cls._start_supervisor()
+
+        topics = [t for t in cls.expand(pattern) if t not in cls.active]
+        success = cls.subscribe_many(topics, expected_interval=expected_interval, history=history, watchdog=watchdog)
+        cls._claim({t: pattern for t in topics})
+        return success
+
+    @classmethod
+    def unsubscribe_pattern(cls, pattern: str) -> bool:
+        """Unsubscribe from the topics a pattern subscribed and stop refreshing it.
+
+        Topics subscribed explicitly, or matching another subscribed pattern,
+        stay subscribed.
+        """
+
+        with cls._lock:
+            added = cls.patterns.pop(pattern, set())
+            topics = []
+            for topic in added:
+                other = next((p for p in cls.patterns if fnmatch.fnmatchcase(topic, p)), None)
+                if other is not None:
+                    cls.patterns[other].add(topic)
+                elif topic in cls.active:
+                    topics.append(topic)
+
+        return cls.unsubscribe_many(topics)
+
+    @classmethod
+    def refresh_patterns(cls) -> list[str]:
+        """Re-expand all subscribed patterns and subscribe to new topics. Returns the new topics."""
+
+        new_topics = {}
+        for pattern in list(cls.patterns):
+            for topic in cls.expand(pattern, refresh=True):
+                if topic not in cls.active:
+                    new_topics.setdefault(topic, pattern)
+
+        if new_topics:
+            hcc2_logger.info(f"Subscribing to {len(new_topics)} new pattern topics.")
+            cls.subscribe_many(list(new_topics))
+            cls._claim(new_topics)
+
+        return list(new_topics)
+
+    @classmethod
+    def _claim(cls, topics: dict):
+        """Record the topics, by pattern, that pattern subscriptions subscribed."""
+        with cls._lock:
+            for topic, pattern in topics.items():
+                if topic in cls.active and pattern in cls.patterns:
+                    cls.patterns[pattern].add(topic)
+
+    @classmethod
+    def _start_supervisor(cls):
+        with cls._lock:
+            if cls.supervisor is None:
+                cls.supervisor = SubscriptionSupervisor()
+                cls.supervisor.start()
+
+    @classmethod
+    def _remove(cls, topic: str):
+        with cls._lock:
+            subscription = cls.active.pop(topic, None)
+            for added in cls.patterns.values():
+                added.discard(topic)
+
+        if subscription is not None:
+            subscription.listener.remove_route(subscription)
+
+    @classmethod
+    def on(cls, pattern: str, handler: Callable):
+        """Call `handler(message)` for every message of topics matching `pattern`.
+
+        `pattern` is a topic or a shell style wildcard pattern and applies to
+        current and future subscriptions. `handler` may be a function or a
+        coroutine function.
+        """
+
+        with cls._lock:
+            cls.handlers.append((pattern, handler))
+            for topic, subscription in cls.active.items():
+                if fnmatch.fnmatchcase(topic, pattern):
+                    subscription.handlers = subscription.handlers + [handler]
+
+    @classmethod
+    def off(cls, pattern: str, handler: Callable):
+        """Remove a handler added with on()."""
+
+        with cls._lock:
+            cls.handlers = [(p, h) for p, h in cls.handlers if (p, h) != (pattern, handler)]
+            for topic, subscription in cls.active.items():
+                subscription.handlers = [h for p, h in cls.handlers if fnmatch.fnmatchcase(topic, p)]
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Return buffer statistics of every active subscription by topic."""
+
+        with cls._lock:
+            active = list(cls.active.items())
+
+        return {topic: subscription.stats() for topic, subscription in active}
+
+    @classmethod
+    def shutdown(cls, unsubscribe=True):
+        """Stop all webhook listeners and release their ports.
+
+        Active subscriptions are first removed from the HCC2 Rest Server
+        unless `unsubscribe` is False.
+        """
+
+        with cls._lock:
+            supervisor, cls.supervisor = cls.supervisor, None
+        if supervisor is not None:
+            supervisor.stop()
+
+        if unsubscribe and cls.active:
+            cls.unsubscribe_many(list(cls.active))
+
+        with cls._lock:
+            for listener in cls.listeners:
+                if listener.running:
+                    listener.stop_server()
+                cls.port_manager.release_port(listener.port)
+            cls.listeners = []
+
+        cls.dispatcher.shutdown()
+
+
+class SubscriptionSupervisor(threading.Thread):
+    """Subscription maintenance thread.
+
+    Re-expands pattern subscriptions every `pattern_refresh_interval` seconds.
+    Stale subscriptions with the watchdog enabled, for example after a REST
+    server restart, are registered again in bulk.
+    """
+
+    period = 1
+
+    def __init__(self):
+        super().__init__(name="Subscription Supervisor", daemon=True)
+        self.stop_event = threading.Event()
+        self.last_refresh = time.monotonic()
+
+    def run(self):
+        while not self.stop_event.wait(self.period):
+            try:
+                self.check()
+            except Exception as exc:
+                hcc2_logger.error(f"Subscription supervisor check failed: {exc}")
+
+    def check(self):
+        """Run any maintenance that is due."""
+        interval = AppConfig.subscription_pattern_refresh_interval
+        if interval > 0 and time.monotonic() - self.last_refresh >= interval:
+            self.last_refresh = time.monotonic()
+            Subscriptions.refresh_patterns()
+
+        if stale := Subscriptions.stale(watched=True):
+            hcc2_logger.warning(f"Resubscribing to {len(stale)} stale subscriptions.")
+            Subscriptions.resubscribe(stale)
+
+    def stop(self):
+        """Stop the supervisor thread."""
+        self.stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=self.period + 1)
@@ -0,0 +1,49 @@
+"""Tests of the generated schema serializers."""
+
+from dataclasses import dataclass, field
+
+from api.hcc2_rest_schema import SimpleMessage, DataPoint, ComplexMessage
+
+
+@dataclass(slots=True)
+class TaggedMessage(SimpleMessage):
+    tag: str = "none"
+
+
+@dataclass(slots=True)
+class TaggedComplexMessage(ComplexMessage):
+    labels: list = field(default_factory=list)
+
+
+def test_simple_message_round_trip():
+    message = SimpleMessage("a.b.", 1.5, "app", 192, "1700000000000")
+    assert SimpleMessage.from_dict(message.to_dict()) == message
+
+
+def test_subclass_to_dict_includes_own_fields():
+    message = TaggedMessage("a.b.", 1.5, "app", 192, "1700000000000", "x")
+    assert message.to_dict()["tag"] == "x"
+
+
+def test_subclass_round_trip():
+    message = TaggedMessage("a.b.", 1.5, "app", 192, "1700000000000", "x")
+    copy = TaggedMessage.from_dict(message.to_dict())
+    assert type(copy) is TaggedMessage
+    assert copy == message
+
+
+def test_nested_subclass_round_trip():
+    message = TaggedComplexMessage("a|.", [DataPoint("x", [1, 2], 192, ["1", "2"])], "app", ["l"])
+    data = message.to_dict()
+    assert data["labels"] == ["l"]
+    assert data["datapoints"][0]["values"] == [1, 2]
+
+    copy = TaggedComplexMessage.from_dict(data)
+    assert isinstance(copy.datapoints[0], DataPoint)
+    assert copy == message
+
+
+def test_parent_unaffected_by_subclass():
+    message = SimpleMessage("a.b.", 1.5, "app", 192, "1700000000000")
+    TaggedMessage.from_dict(TaggedMessage("a.b.", 1).to_dict())
+    assert "tag" not in message.to_dict()
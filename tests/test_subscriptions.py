@@ -0,0 +1,97 @@
+"""Tests of the lazy subscription payload scan."""
+
+import pytest
+
+from config import AppConfig
+from services.subscriptions import _scan_topic, _check_payload, LazyMessage, Subscription, WebhookListener
+
+
+@pytest.mark.parametrize("raw, topic", [
+    (b'{"topic":"a.b.","value":1}', "a.b."),
+    (b'{ "topic" : "a.b.", "value": 1 }', "a.b."),
+    (b'{"value":1,"msgSource":"x","topic":"a.b."}', "a.b."),
+    # Key text inside a string value
+    (b'{"value":"\\"topic\\"x", "topic":"a"}', "a"),
+    (b'{"datapoints":[{"dataPointName":"x"}],"topic":"a|."}', "a|."),
+])
+def test_scan_topic(raw, topic):
+    assert _scan_topic(raw) == topic
+
+
+@pytest.mark.parametrize("raw", [
+    # Key text inside a string value
+    b'{"value":"x\\"topic", "topic":"a"}',
+    b'{"value":"x\\"topic\\":\\"a"}',
+    # Topic as a value, not a key
+    b'{"value":"topic","msgSource":"x","topic":"a"}',
+    b'{"value":"topic","msgSource":"x"}',
+    # Key of a nested object
+    b'{"value":{"topic":"x"},"msgSource":"y"}',
+    b'{"datapoints":[{"topic":"x"}],"topic":"a"}',
+    # Duplicate keys
+    b'{"topic":"a","topic":"b","value":1}',
+    # Escaped topic
+    b'{"topic":"a\\u002eb","value":1}',
+    b'{"value":1}',
+])
+def test_scan_topic_ambiguous(raw):
+    assert _scan_topic(raw) is None
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"topic":"a.b.","value":1}',
+    b'{"topic":"a.b.","value":"null text"}',
+    b'{"topic":"a|.","datapoints":[{"dataPointName":"x","values":[1]}],"msgSource":"app"}',
+    b'{"topic":"a|.","datapoints": [ {"dataPointName":"x"}],"msgSource":"app"}',
+])
+def test_check_payload(raw):
+    assert _check_payload(raw)
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"topic":"a.b.","value":null}',
+    b'{"topic":"a|.","datapoints":[],"msgSource":"app"}',
+    b'{"topic":"a|.","datapoints":[ ],"msgSource":"app"}',
+    b'{"topic":"a|.","datapoints":null,"msgSource":"app"}',
+    b'{"topic":"a|.","datapoints":[{"dataPointName":"x"}]}',
+    # Keys only present inside strings or nested objects
+    b'{"topic":"a.b.","msgSource":"\\"datapoints\\":[{"}',
+    b'{"topic":"a.b.","msgSource":"x \\"value\\": 1"}',
+    b'{"topic":"a.b.","other":{"value":1}}',
+    b'[{"topic":"a.b.","value":1}]',
+    b'{"topic":"a.b.","value":1',
+])
+def test_check_payload_rejects(raw):
+    assert not _check_payload(raw)
+
+
+@pytest.fixture
+def listener(monkeypatch):
+    monkeypatch.setattr(AppConfig, "subscription_lazy_parsing", True)
+    listener = WebhookListener(port=0)
+    for topic in ("test.a.", "test.b."):
+        listener.add_route(Subscription(topic, 1, listener, history=0))
+    return listener
+
+
+def test_ingest_lazy(listener):
+    assert listener.ingest(1, b'{"topic":"test.a.","value":1}')[0] == 200
+    message = listener.route(1, LazyMessage("test.a.", b"")).get()
+    assert isinstance(message, LazyMessage)
+    assert message.value == 1
+
+
+def test_ingest_ambiguous_falls_back(listener):
+    raw = b'{"value":"x\\"topic","msgSource":"test.b.","topic":"test.a."}'
+    assert listener.ingest(1, raw)[0] == 200
+
+    subscription = listener.route(1, LazyMessage("test.a.", b""))
+    message = subscription.get()
+    assert not isinstance(message, LazyMessage)
+    assert message.value == 'x"topic'
+    assert listener.route(1, LazyMessage("test.b.", b"")).get() is None
+
+
+def test_ingest_skips_empty_datapoints(listener):
+    listener.ingest(1, b'{"topic":"test.a.","datapoints":[],"msgSource":"app"}')
+    assert listener.route(1, LazyMessage("test.a.", b"")).get() is None
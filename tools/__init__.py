@@ -0,0 +1,8 @@
+"""tools
+
+This package contains development tools which run without an HCC2.
+
+Modules
+- hcc2_rest_simulator : Local stand-in HCC2 REST server with fault injection.
+- benchmark : Benchmark suite for the REST client hot paths.
+"""
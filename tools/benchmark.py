@@ -0,0 +1,338 @@
+"""benchmark.py
+
+Benchmark suite for the REST client hot paths.
+
+Drives RestAPI against an in-process HCC2 REST server simulator and reports
+throughput and p50/p95/p99 latency per scenario as JSON. Results from two
+runs can be compared to spot regressions between versions.
+
+The memory benchmark reports the bytes allocated per schema object, as held
+in subscription buffers and caches, and the bytes the topic registry keeps
+per registered data point topic.
+
+Run from the project root,
+    python -m tools.benchmark --output results.json
+    python -m tools.benchmark --scenarios "read_simple_*" --compare results.json
+    python -m tools.benchmark --scenarios none --memory
+"""
+
+import sys
+import json
+import time
+import fnmatch
+import platform
+import argparse
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable
+
+# Local
+from api import RestAPI, topic_registry
+from api.hcc2_rest_schema import (
+    SimpleMessage, ComplexMessage, DataPoint,
+    GeneralDataPoint, ConfigDataPoint, TagMetadata, TagUnityUI
+)
+from api.hcc2_rest_enums import TagCategory, TagDataType, TagSubClass
+from config import AppConfig
+from tools.hcc2_rest_simulator import HCC2RestSimulator, FaultConfig
+
+
+@dataclass
+class Scenario:
+    """
+    A single benchmark scenario.
+
+    Attributes:
+    -----------
+    name: str
+        Unique scenario name.
+    run: Callable
+        Operation timed once per iteration.
+    items: int
+        Number of topics, messages or tags handled per iteration.
+    """
+    name: str
+    run: Callable
+    items: int = 1
+
+
+def _percentile(sorted_values: list, percent: float) -> float:
+    """Nearest rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(scenario: Scenario, iterations: int, warmup: int) -> dict:
+    """Time a scenario. Returns throughput and latency statistics."""
+
+    for _ in range(warmup):
+        scenario.run()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter_ns()
+        scenario.run()
+        latencies.append((time.perf_counter_ns() - t0) / 1e6)
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "name": scenario.name,
+        "iterations": iterations,
+        "items": scenario.items,
+        "total_s": round(total, 6),
+        "ops_per_s": round(iterations / total, 2) if total else 0.0,
+        "items_per_s": round(iterations * scenario.items / total, 2) if total else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 4),
+        "p50_ms": round(_percentile(latencies, 50), 4),
+        "p95_ms": round(_percentile(latencies, 95), 4),
+        "p99_ms": round(_percentile(latencies, 99), 4),
+        "max_ms": round(latencies[-1], 4)
+    }
+
+
+def _simple_topics(count: int) -> list[str]:
+    return [f"liveValue.production.this.{AppConfig.app_func_name}.0.bench.simple{i}." for i in range(count)]
+
+
+def _complex_topics(count: int) -> list[str]:
+    return [f"liveValue.production.this.{AppConfig.app_func_name}.0.bench.complex{i}|." for i in range(count)]
+
+
+def _general_datapoints(count: int) -> list[GeneralDataPoint]:
+    return [
+        GeneralDataPoint(
+            topic=f"bench.tag{i}",
+            tagSubClass=TagSubClass.PRODUCTION,
+            metadata=TagMetadata(dataType=TagDataType.FLOAT),
+            unityUI=TagUnityUI(displayName=f"Bench Tag {i}", shortDisplayName=f"bench{i}")
+        )
+        for i in range(count)
+    ]
+
+
+def build_scenarios(rest_api: RestAPI, simulator: HCC2RestSimulator) -> list[Scenario]:
+    """Create all benchmark scenarios and seed the simulator with their tags."""
+
+    scenarios = []
+    sizes = (1, 10, 100, 1000)
+
+    simple_topics = _simple_topics(max(sizes))
+    complex_topics = _complex_topics(max(sizes))
+    simulator.define_tags(simple_topics, value=1.5)
+    rest_api.message_write_complex([
+        ComplexMessage(topic, [DataPoint("dp1", [1.0, 2.0, 3.0]), DataPoint("dp2", [4.0])])
+        for topic in complex_topics
+    ])
+
+    for n in sizes:
+        scenarios.append(Scenario(f"read_simple_{n}", lambda t=simple_topics[:n]: rest_api.message_read_simple(t), n))
+    for n in sizes:
+        scenarios.append(Scenario(f"read_complex_{n}", lambda t=complex_topics[:n]: rest_api.message_read_complex(t), n))
+
+    for n in (10, 100, 1000):
+        scenarios.append(Scenario(
+            f"write_simple_{n}",
+            lambda t=simple_topics[:n]: rest_api.message_write_simple([SimpleMessage(topic, 2.5) for topic in t]),
+            n))
+    for n in (10, 100, 1000):
+        scenarios.append(Scenario(
+            f"write_complex_{n}",
+            lambda t=complex_topics[:n]: rest_api.message_write_complex(
+                [ComplexMessage(topic, [DataPoint("dp1", [1.0, 2.0, 3.0])]) for topic in t]),
+            n))
+
+    scenarios.append(Scenario("heartbeat", lambda: rest_api.heartbeat_app(AppConfig.app_func_name)))
+
+    for n in (100, 1000):
+        datapoints = _general_datapoints(n)
+        scenarios.append(Scenario(
+            f"create_datapoints_{n}",
+            lambda d=datapoints: rest_api.create_datapoints(AppConfig.app_func_name, TagCategory.GENERAL, d),
+            n))
+
+    scenarios += build_serializer_scenarios()
+
+    return scenarios
+
+
+def build_serializer_scenarios(count=10000) -> list[Scenario]:
+    """Schema to_dict/from_dict on `count` message batches, with dataclasses.asdict as reference."""
+
+    simple = [SimpleMessage(topic, float(i)) for i, topic in enumerate(_simple_topics(count))]
+    complex_ = [
+        ComplexMessage(topic, [DataPoint("dp1", [1.0, 2.0, 3.0]), DataPoint("dp2", [4.0])])
+        for topic in _complex_topics(count)
+    ]
+    datapoints = _general_datapoints(count)
+    simple_dicts = [message.to_dict() for message in simple]
+    complex_dicts = [message.to_dict() for message in complex_]
+
+    return [
+        Scenario(f"to_dict_simple_{count}", lambda: [m.to_dict() for m in simple], count),
+        Scenario(f"asdict_simple_{count}", lambda: [asdict(m) for m in simple], count),
+        Scenario(f"to_dict_complex_{count}", lambda: [m.to_dict() for m in complex_], count),
+        Scenario(f"asdict_complex_{count}", lambda: [asdict(m) for m in complex_], count),
+        Scenario(f"to_dict_datapoints_{count}", lambda: [d.to_dict() for d in datapoints], count),
+        Scenario(f"asdict_datapoints_{count}", lambda: [asdict(d) for d in datapoints], count),
+        Scenario(f"from_dict_simple_{count}", lambda: [SimpleMessage.from_dict(d) for d in simple_dicts], count),
+        Scenario(f"from_dict_complex_{count}", lambda: [ComplexMessage.from_dict(d) for d in complex_dicts], count)
+    ]
+
+
+def _allocated_per_object(factory: Callable, topics: list[str]) -> float:
+    """Average bytes allocated by `factory(i, topic)` per object while one object per topic is alive."""
+
+    count = len(topics)
+    objects = [None] * count
+    tracemalloc.start()
+    try:
+        for i in range(count):
+            objects[i] = factory(i, topics[i])
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return round(allocated / count, 1)
+
+
+def _registered_per_topic(topics: list[str], prefix: str) -> float:
+    """Average bytes the topic registry and its resolve cache keep per newly registered topic."""
+
+    tracemalloc.start()
+    try:
+        for topic in topics:
+            topic_registry.resolve(topic, prefix)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return round(allocated / len(topics), 1)
+
+
+def measure_memory(count=100000) -> list[dict]:
+    """Bytes per live schema object, including the values and lists it owns.
+
+    Data point topics are interned in the topic registry on creation. That
+    cost is shared by every object of a topic, so it is measured on its own
+    and reported as a `<schema> registry` line in bytes per topic, followed
+    by the bytes of each object for already registered topics.
+    """
+
+    metadata = TagMetadata(dataType=TagDataType.FLOAT)
+    unity_ui = TagUnityUI(displayName="Bench Tag", shortDisplayName="bench")
+    general_prefix = f"liveValue.{TagSubClass.PRODUCTION}.this.{AppConfig.app_func_name}.0."
+    config_prefix = f"liveValue.postvalidConfig.this.{AppConfig.app_func_name}.0."
+    factories = {
+        "SimpleMessage": (lambda i, t: SimpleMessage(t, float(i), "bench", 192, "1700000000000"), "bench.simple{}.", None),
+        "DataPoint": (lambda i, t: DataPoint(t, [float(i)], 192, ["1700000000000"]), "dp{}", None),
+        "ComplexMessage": (lambda i, t: ComplexMessage(t, [], "bench"), "bench.complex{}|.", None),
+        "GeneralDataPoint": (lambda i, t: GeneralDataPoint(t, TagSubClass.PRODUCTION, metadata, unity_ui), "bench.tag{}", general_prefix),
+        "ConfigDataPoint": (lambda i, t: ConfigDataPoint(t, metadata, unity_ui, "0"), "bench.config{}", config_prefix)
+    }
+
+    results = []
+    for name, (factory, topic_format, prefix) in factories.items():
+        topics = [topic_format.format(i) for i in range(count)]
+        if prefix is not None:
+            results.append({"name": f"{name} registry", "count": count, "bytes_per_object": _registered_per_topic(topics, prefix)})
+            print(f"{results[-1]['name']:<26} {results[-1]['bytes_per_object']:>10} bytes/topic", file=sys.stderr)
+        results.append({"name": name, "count": count, "bytes_per_object": _allocated_per_object(factory, topics)})
+        print(f"{name:<26} {results[-1]['bytes_per_object']:>10} bytes/object", file=sys.stderr)
+    return results
+
+
+def compare(results: dict, baseline: dict) -> list[dict]:
+    """Return the relative change of throughput and p95 latency against a baseline run."""
+
+    baseline_results = {r["name"]: r for r in baseline.get("results", [])}
+    changes = []
+    for result in results["results"]:
+        base = baseline_results.get(result["name"])
+        if base is None or not base["ops_per_s"] or not base["p95_ms"]:
+            continue
+        changes.append({
+            "name": result["name"],
+            "ops_per_s_change": round(result["ops_per_s"] / base["ops_per_s"] - 1, 4),
+            "p95_ms_change": round(result["p95_ms"] / base["p95_ms"] - 1, 4)
+        })
+
+    baseline_memory = {r["name"]: r for r in baseline.get("memory", [])}
+    for result in results.get("memory", []):
+        base = baseline_memory.get(result["name"])
+        if base is None or not base["bytes_per_object"]:
+            continue
+        changes.append({
+            "name": f"memory_{result['name']}",
+            "bytes_per_object_change": round(result["bytes_per_object"] / base["bytes_per_object"] - 1, 4)
+        })
+    return changes
+
+
+def run(patterns=("*",), iterations=200, warmup=10, latency_ms=0.0) -> dict:
+    """Run the matching scenarios against an in-process simulator."""
+
+    with HCC2RestSimulator(port=0, publish_hz=0, faults=FaultConfig(latency_ms=latency_ms)) as simulator:
+        AppConfig.rest_ip = simulator.host
+        AppConfig.rest_port = simulator.port
+
+        rest_api = RestAPI()
+        rest_api.initialize_app(AppConfig.app_func_name)
+        rest_api.register_app(AppConfig.app_func_name)
+
+        results = []
+        for scenario in build_scenarios(rest_api, simulator):
+            if any(fnmatch.fnmatchcase(scenario.name, p) for p in patterns):
+                results.append(measure(scenario, iterations, warmup))
+                print(f"{scenario.name:<24} {results[-1]['ops_per_s']:>10} ops/s  p95 {results[-1]['p95_ms']} ms", file=sys.stderr)
+
+    RestAPI.close()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_codec": RestAPI.codec.name,
+            "iterations": iterations,
+            "warmup": warmup,
+            "latency_ms": latency_ms
+        },
+        "results": results
+    }
+
+
+def main():
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="HCC2 REST client benchmarks")
+    parser.add_argument("--scenarios", nargs="*", default=["*"], help="Scenario name patterns to run")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated REST server latency")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--memory", action="store_true", help="Also measure memory per schema object")
+    parser.add_argument("--memory-count", type=int, default=100000, help="Objects alive during the memory benchmark")
+    args = parser.parse_args()
+
+    results = run(args.scenarios, args.iterations, args.warmup, args.latency_ms)
+    if args.memory:
+        results["memory"] = measure_memory(args.memory_count)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            results["comparison"] = compare(results, json.load(file))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
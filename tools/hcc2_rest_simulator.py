@@ -0,0 +1,540 @@
+"""hcc2_rest_simulator.py
+
+Local stand-in for the HCC2 REST server.
+
+Implements the app-creator, app-registration, app-provision, message and
+subscription endpoints used by this project against an in-memory tag store.
+Subscribers receive webhook callbacks at a configurable rate. Latency, error
+and timeout faults can be injected to measure throughput and resilience
+without an HCC2.
+
+Run standalone from the project root,
+    python -m tools.hcc2_rest_simulator --port 7071 --publish-hz 2 --latency-ms 5
+"""
+
+import io
+import time
+import json
+import fnmatch
+import random
+import logging
+import tarfile
+import argparse
+import threading
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party
+import requests
+from flask import Flask, request, jsonify, Response
+from werkzeug.serving import make_server
+
+# Local
+from api.hcc2_rest_enums import MessageQuality
+
+
+def _now_ms() -> str:
+    return str(time.time_ns() // 1_000_000)
+
+
+@dataclass
+class FaultConfig:
+    """
+    Fault injection settings. May be changed while the simulator is running.
+
+    Attributes:
+    -----------
+    latency_ms: float
+        Fixed delay added to every response.
+    jitter_ms: float
+        Random extra delay added to every response (uniform 0 - jitter_ms).
+    error_rate: float
+        Fraction of requests answered with `error_status`.
+    error_status: int
+        HTTP status used for injected errors.
+    timeout_rate: float
+        Fraction of requests stalled for `timeout_ms` before answering.
+    timeout_ms: float
+        Stall time of a timed out request, longer than the client timeout.
+    down: bool
+        Answer every request with `error_status`, as if the server was restarting.
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    timeout_rate: float = 0.0
+    timeout_ms: float = 5000.0
+    down: bool = False
+
+
+class TagStore:
+    """Thread safe in-memory tag store keyed by topic FQN."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._simple = {}
+        self._complex = {}
+
+    def define(self, topic: str, value=0, msg_source="hcc2RestSimulator"):
+        """Create a tag if it does not already exist."""
+        with self._lock:
+            if topic.endswith("|.") and topic not in self._complex:
+                self._complex[topic] = {"msgSource": msg_source, "datapoints": {}}
+            elif not topic.endswith("|.") and topic not in self._simple:
+                self._simple[topic] = {
+                    "topic": topic, "value": value, "msgSource": msg_source,
+                    "quality": MessageQuality.GOOD, "timeStamp": _now_ms()
+                }
+
+    def exists(self, topic: str) -> bool:
+        """Return True if the tag is defined."""
+        return topic in self._simple or topic in self._complex
+
+    def topics(self) -> list[str]:
+        """Return all defined topics."""
+        with self._lock:
+            return list(self._simple) + list(self._complex)
+
+    def write(self, message: dict):
+        """Store a simple or complex message."""
+        topic = message["topic"]
+        with self._lock:
+            if "datapoints" in message:
+                tag = self._complex.setdefault(topic, {"msgSource": "", "datapoints": {}})
+                tag["msgSource"] = message.get("msgSource", tag["msgSource"])
+                for dp in message["datapoints"]:
+                    values = dp.get("values", [])
+                    tag["datapoints"][dp["dataPointName"]] = {
+                        "dataPointName": dp["dataPointName"],
+                        "values": values,
+                        "quality": dp.get("quality", MessageQuality.GOOD),
+                        "timeStamps": dp.get("timeStamps") or [_now_ms()] * len(values)
+                    }
+            else:
+                self._simple[topic] = {
+                    "topic": topic,
+                    "value": message.get("value"),
+                    "msgSource": message.get("msgSource", ""),
+                    "quality": message.get("quality", MessageQuality.GOOD),
+                    "timeStamp": message.get("timeStamp") or _now_ms()
+                }
+
+    def read(self, topic: str):
+        """Return a simple message dict, or None."""
+        with self._lock:
+            tag = self._simple.get(topic)
+            return dict(tag) if tag is not None else None
+
+    def read_advanced(self, topic: str):
+        """Return a complex message dict, or None. Simple tags are returned as one datapoint."""
+        with self._lock:
+            tag = self._complex.get(topic)
+            if tag is not None:
+                return {
+                    "topic": topic,
+                    "msgSource": tag["msgSource"],
+                    "datapoints": [dict(dp) for dp in tag["datapoints"].values()]
+                }
+
+            tag = self._simple.get(topic)
+            if tag is not None:
+                return {
+                    "topic": topic,
+                    "msgSource": tag["msgSource"],
+                    "datapoints": [{
+                        "dataPointName": "value",
+                        "values": [tag["value"]],
+                        "quality": tag["quality"],
+                        "timeStamps": [tag["timeStamp"]]
+                    }]
+                }
+        return None
+
+    def drift(self, topic: str):
+        """Change a simulated IO value, used to give subscribers fresh data."""
+        with self._lock:
+            tag = self._simple.get(topic)
+            if tag is None:
+                return
+            if isinstance(tag["value"], bool):
+                tag["value"] = tag["value"] if random.random() < 0.9 else not tag["value"]
+            elif isinstance(tag["value"], (int, float)):
+                tag["value"] = round(tag["value"] + random.uniform(-0.5, 0.5), 3)
+            tag["timeStamp"] = _now_ms()
+
+
+class HCC2RestSimulator:
+    """HCC2 REST server simulator.
+
+    Serves on a background thread. Use as a context manager or call start()
+    and stop(). Port 0 binds a free port, read it back from `port`.
+    A `publish_hz` of 0 or less disables subscription callbacks.
+    """
+
+    api_prefix = "/api/v1/"
+
+    def __init__(self, host="127.0.0.1", port=7071, publish_hz=1.0, faults=None, strict=False, seed_io=True):
+        self.host = host
+        self.port = port
+        self.publish_hz = publish_hz
+        self.faults = faults or FaultConfig()
+        self.strict = strict
+        self.tags = TagStore()
+        self.apps = {}
+        self.subscriptions = {}
+        self.stats = {"requests": 0, "errors_injected": 0, "timeouts_injected": 0, "callbacks": 0, "callback_errors": 0}
+
+        self._lock = threading.Lock()
+        self._server = None
+        self._server_thread = None
+        self._publisher = None
+        self._stop_event = threading.Event()
+        self._callback_session = requests.Session()
+
+        if seed_io:
+            self._seed_io_tags()
+
+        self.app = Flask(__name__)
+        logging.getLogger('werkzeug').setLevel(logging.CRITICAL)
+        self._add_routes()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the simulated REST API."""
+        return f"http://{self.host}:{self.port}{self.api_prefix}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+    # Lifecycle
+    def start(self):
+        """Start the HTTP server and the subscription publisher."""
+        self._server = make_server(self.host, self.port, self.app, threaded=True)
+        self.port = self._server.server_port
+        self._stop_event.clear()
+        self._server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._server_thread.start()
+        if self.publish_hz > 0:
+            self._publisher = threading.Thread(target=self._publish_loop, daemon=True)
+            self._publisher.start()
+        return self
+
+    def stop(self):
+        """Stop the HTTP server and the subscription publisher."""
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server_thread.join(timeout=1)
+            self._server = None
+        if self._publisher is not None:
+            self._publisher.join(timeout=1)
+            self._publisher = None
+
+
+    # Test Helpers
+    def provision(self, app_name: str, parameters: dict):
+        """Stage a new provisioning deployment for an application."""
+        with self._lock:
+            app = self.apps.setdefault(app_name, self._new_app())
+            app["pre_valid"] = dict(parameters)
+            app["has_new_config"] = True
+
+    def define_tags(self, topics: list[str], value=0):
+        """Create tags in the tag store."""
+        for topic in topics:
+            self.tags.define(topic, value)
+
+    def _seed_io_tags(self):
+        """Create the HCC2 IO board diagnostics tags."""
+        io_prefix = "liveValue.diagnostics.this.io.0."
+        for ch in range(1, 9):
+            for group in ("digitalIn", "digitalIoIn", "digitalIoOut"):
+                self.tags.define(f"{io_prefix}{group}.ch{ch}.", False)
+            for group in ("digitalInCount", "digitalIoCount", "digitalIoDuty"):
+                self.tags.define(f"{io_prefix}{group}.ch{ch}.", 0)
+            self.tags.define(f"{io_prefix}analogIn.eu.ch{ch}.", 12.0)
+            self.tags.define(f"{io_prefix}analogIn.perc.ch{ch}.", 50.0)
+        for ch in range(1, 3):
+            self.tags.define(f"{io_prefix}analogOut.ch{ch}.", 0.0)
+        for rail, volts in (("v1p2", 1.2), ("v3p3", 3.3), ("v5", 5.0)):
+            self.tags.define(f"{io_prefix}rail.voltage.{rail}.", volts)
+
+    @staticmethod
+    def _new_app() -> dict:
+        return {"registered": False, "is_up": False, "has_new_config": False, "pre_valid": {}, "is_complex": False}
+
+
+    # Fault Injection
+    def _inject(self):
+        """Apply latency and fault injection. Returns an error response or None."""
+        faults = self.faults
+        with self._lock:
+            self.stats["requests"] += 1
+
+        delay = faults.latency_ms + random.uniform(0, faults.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if faults.timeout_rate and random.random() < faults.timeout_rate:
+            with self._lock:
+                self.stats["timeouts_injected"] += 1
+            time.sleep(faults.timeout_ms / 1000)
+
+        if faults.down or (faults.error_rate and random.random() < faults.error_rate):
+            with self._lock:
+                self.stats["errors_injected"] += 1
+            return jsonify({"error": "injected fault"}), faults.error_status
+
+        return None
+
+
+    # Routes
+    def _add_routes(self):
+        app = self.app
+        p = self.api_prefix
+
+        @app.before_request
+        def faults():
+            if not request.path.startswith("/simulator/"):
+                return self._inject()
+            return None
+
+        # Simulator control
+        @app.route("/simulator/faults", methods=["GET", "PUT"])
+        def simulator_faults():
+            if request.method == "PUT":
+                for key, value in (request.get_json() or {}).items():
+                    if hasattr(self.faults, key):
+                        setattr(self.faults, key, value)
+            return jsonify(asdict(self.faults))
+
+        @app.route("/simulator/stats", methods=["GET"])
+        def simulator_stats():
+            with self._lock:
+                return jsonify({**self.stats, "subscriptions": len(self.subscriptions), "tags": len(self.tags.topics())})
+
+        @app.route("/simulator/provision/<app_name>", methods=["POST"])
+        def simulator_provision(app_name):
+            self.provision(app_name, request.get_json() or {})
+            return "", 204
+
+        # App creator
+        @app.route(f"{p}app-creator/<app_name>/defaults", methods=["PUT"])
+        def initialize_app(app_name):
+            with self._lock:
+                self.apps[app_name] = self._new_app()
+            return jsonify({}), 201
+
+        @app.route(f"{p}app-creator/<app_name>", methods=["POST"])
+        def open_app(app_name):
+            if "appFile" not in request.files:
+                return jsonify({"error": "appFile missing"}), 400
+
+            with self._lock:
+                self.apps[app_name] = self._new_app()
+
+            # Create the general and config tags described by metadata.json
+            try:
+                with tarfile.open(fileobj=io.BytesIO(request.files["appFile"].read()), mode="r:gz") as tar:
+                    metadata = json.loads(tar.extractfile("metadata.json").read())
+                    parameters = json.loads(tar.extractfile("parameters.json").read())
+            except (KeyError, tarfile.TarError, ValueError):
+                metadata, parameters = {}, {}
+
+            for topic in metadata.get("general", {}):
+                self.tags.define(topic if topic.endswith(".") else f"{topic}.")
+            for topic in metadata.get("config", {}):
+                name = topic.rstrip(".:")
+                self.tags.define(f"liveValue.postvalidConfig.this.{app_name}.0.{name}.", parameters.get(name, 0))
+
+            return jsonify({}), 201
+
+        @app.route(f"{p}app-creator/<app_name>/datapoint/<tag_type>", methods=["PUT"])
+        def create_datapoints(app_name, tag_type):
+            for tag in (request.get_json() or {}).get("tagsList", []):
+                if tag_type == "config":
+                    fqn = f"liveValue.postvalidConfig.this.{app_name}.0.{tag['topic']}"
+                    value = tag.get("defaultValue", 0)
+                else:
+                    fqn = f"liveValue.{tag.get('tagSubClass', 'production')}.this.{app_name}.0.{tag['topic']}"
+                    value = 0
+                self.tags.define(fqn if fqn.endswith(".") else f"{fqn}.", value)
+            return jsonify({}), 200
+
+        # App registration
+        @app.route(f"{p}app-registration/<app_name>", methods=["POST"])
+        def register_app(app_name):
+            with self._lock:
+                app_state = self.apps.setdefault(app_name, self._new_app())
+                app_state["registered"] = True
+                app_state["is_complex"] = request.args.get("isComplexProvisioned", "false") == "true"
+            return jsonify({}), 201
+
+        # App provisioning
+        @app.route(f"{p}app-provision/<app_name>", methods=["GET", "PUT", "POST"])
+        def app_provision(app_name):
+            with self._lock:
+                app_state = self.apps.get(app_name)
+                if app_state is None or not app_state["registered"]:
+                    return jsonify({"error": f"{app_name} is not registered"}), 404
+
+                # Status
+                if request.method == "GET":
+                    return jsonify({"hasNewConfig": app_state["has_new_config"]})
+
+                # Heartbeat
+                if request.method == "PUT":
+                    app_state["is_up"] = bool((request.get_json() or {}).get("isUp"))
+                    return jsonify({}), 200
+
+                # Validation result
+                is_valid = bool((request.get_json() or {}).get("isValid"))
+                app_state["has_new_config"] = False
+                pre_valid = dict(app_state["pre_valid"]) if is_valid else {}
+
+            for key, value in pre_valid.items():
+                if key != "hash":
+                    self.tags.write({"topic": f"liveValue.postvalidConfig.this.{app_name}.0.{key}.", "value": value})
+
+            return "", 204
+
+        @app.route(f"{p}app-provision/<app_name>/targz", methods=["GET"])
+        def app_provision_targz(app_name):
+            with self._lock:
+                app_state = self.apps.get(app_name)
+                if app_state is None:
+                    return jsonify({"error": f"{app_name} is not registered"}), 404
+                parameters = json.dumps(app_state["pre_valid"]).encode("utf-8")
+
+            archive = io.BytesIO()
+            with tarfile.open(fileobj=archive, mode="w:gz") as tar:
+                info = tarfile.TarInfo("parameters_this_0.json")
+                info.size = len(parameters)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(parameters))
+
+            return Response(archive.getvalue(), mimetype="application/octet-stream")
+
+        # Messages
+        @app.route(f"{p}message/read", methods=["POST"])
+        def message_read():
+            topics = (request.get_json() or {}).get("topics", [])
+            messages = [m for m in (self.tags.read(t) for t in topics) if m is not None]
+            if self.strict and len(messages) != len(topics):
+                return jsonify({"error": "unknown topic"}), 404
+            return jsonify(messages)
+
+        @app.route(f"{p}message/read-advanced", methods=["POST"])
+        def message_read_advanced():
+            topics = (request.get_json() or {}).get("topics", [])
+            messages = [m for m in (self.tags.read_advanced(t) for t in topics) if m is not None]
+            if self.strict and len(messages) != len(topics):
+                return jsonify({"error": "unknown topic"}), 404
+            return jsonify(messages)
+
+        @app.route(f"{p}message/write", methods=["POST"])
+        @app.route(f"{p}message/write-advanced", methods=["POST"])
+        def message_write():
+            messages = request.get_json() or []
+            if self.strict and not all(self.tags.exists(m["topic"]) for m in messages):
+                return jsonify({"error": "unknown topic"}), 404
+            for message in messages:
+                self.tags.write(message)
+            return jsonify({}), 200
+
+        @app.route(f"{p}message/list", methods=["POST"])
+        def message_list():
+            filters = (request.get_json() or {}).get("topics", [])
+            topics = self.tags.topics()
+            matched = [
+                t for t in topics
+                if any(fnmatch.fnmatchcase(t, f) if any(c in f for c in "*?[") else t.startswith(f) for f in filters)
+            ]
+            return jsonify({"topics": matched})
+
+        # Subscriptions
+        @app.route(f"{p}message/subscription/<app_name>", methods=["POST"])
+        def subscribe(app_name):
+            body = request.get_json() or {}
+            callback = body.get("callbackAPi")
+            if not callback:
+                return jsonify({"error": "callbackAPi missing"}), 400
+            with self._lock:
+                for topic in body.get("topics", []):
+                    self.subscriptions[(app_name, topic)] = callback
+            return jsonify({}), 200
+
+        @app.route(f"{p}message/subscription/<app_name>/<path:topic>", methods=["DELETE"])
+        def unsubscribe(app_name, topic):
+            with self._lock:
+                self.subscriptions.pop((app_name, topic), None)
+            return jsonify({}), 200
+
+
+    # Subscription Publisher
+    def _publish_loop(self):
+        """Push the current value of every subscribed topic at `publish_hz`."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            while not self._stop_event.is_set():
+                started = time.monotonic()
+
+                with self._lock:
+                    subscriptions = list(self.subscriptions.items())
+
+                for (_, topic), callback in subscriptions:
+                    self.tags.drift(topic)
+                    payload = self.tags.read(topic)
+                    if payload is None and topic.endswith("|."):
+                        payload = self.tags.read_advanced(topic)
+                    if payload is not None:
+                        executor.submit(self._push, callback, payload)
+
+                self._stop_event.wait(max(0, 1 / self.publish_hz - (time.monotonic() - started)))
+
+    def _push(self, callback: str, payload: dict):
+        try:
+            self._callback_session.post(callback, json=payload, timeout=2)
+            with self._lock:
+                self.stats["callbacks"] += 1
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self.stats["callback_errors"] += 1
+
+
+def main():
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description="HCC2 REST server simulator")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7071)
+    parser.add_argument("--publish-hz", type=float, default=1.0, help="Subscription callback rate per topic, 0 disables callbacks")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--strict", action="store_true", help="Reject reads and writes of unknown topics")
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate
+    )
+
+    simulator = HCC2RestSimulator(args.host, args.port, args.publish_hz, faults, args.strict)
+    simulator.start()
+    print(f"HCC2 REST simulator listening on {simulator.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from types import SimpleNamespace
 from api.hcc2_rest_schema import (
     GeneralDataPoint, ConfigDataPoint
 )
+from api.hcc2_rest_decode import value_decoders
 
 
 class DataPoints:
@@ -38,6 +39,7 @@ class DataPoints:
         # Add data point
         cls.general_points.append(datapoint)
         setattr(cls.general, key, datapoint)
+        value_decoders.register_datapoint(datapoint)
 
     @classmethod
     def add_config(cls, datapoint : ConfigDataPoint):
@@ -53,3 +55,4 @@ class DataPoints:
         # Add data point
         cls.config_points.append(datapoint)
         setattr(cls.config, key, datapoint)
+        value_decoders.register_datapoint(datapoint)